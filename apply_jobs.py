@@ -0,0 +1,691 @@
+import asyncio
+import logging
+import os
+import re
+import tempfile
+from typing import Any, Dict, List, Optional
+
+from playwright.async_api import async_playwright, expect, TimeoutError as PlaywrightTimeoutError
+
+from pydantic import ValidationError
+
+import config
+import supabase_utils
+from llm_client import primary_client
+from models import FormAnswersOutput
+
+# --- Logging Setup ---
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Persistent profile directory so LinkedIn session cookies survive between
+# runs and we usually skip the login form entirely.
+USER_DATA_DIR = "linkedin_user_data"
+
+# --- Selectors ---
+# Defined once here instead of being rebuilt (and re-parsed by Playwright)
+# inline at every call site.
+PROFILE_AVATAR = "img.global-nav__me-photo"
+EASY_APPLY_BUTTON = "div.jobs-apply-button--top-card button.jobs-apply-button"
+EASY_APPLY_MODAL = "div[role='dialog'].jobs-easy-apply-modal"
+RESUME_SECTION = "div:has(> h3:text-is('Resume'))"
+SELECTED_RESUME_CARD = "div.jobs-document-upload-redesign-card__container--selected"
+RESUME_FILE_NAME = "h3.jobs-document-upload-redesign-card__file-name"
+INTERACTIVE_FIELDS = "input, textarea, select"
+CITY_TYPEAHEAD_DROPDOWN = "div.basic-typeahead__triggered-content"
+CITY_TYPEAHEAD_OPTION = "div.basic-typeahead__selectable"
+VALIDATION_ERROR = "div.artdeco-inline-feedback--error"
+
+# Easy Apply needs the page HTML and form XHRs; images, web fonts, media
+# and tracking beacons are the bulk of the bytes and none of the function.
+_BLOCKED_RESOURCE_TYPES = {"image", "font", "media"}
+
+
+async def _block_heavy_requests(route):
+    request = route.request
+    if request.resource_type in _BLOCKED_RESOURCE_TYPES or "li/track" in request.url:
+        await route.abort()
+    else:
+        await route.continue_()
+
+# URLs a successful (or challenged) login can land on.
+_FEED_URL_RE = re.compile(r"/(feed|checkpoint)/")
+
+# Field-kind matchers, compiled once at import. The field loop searches a
+# single "<id> <label>" string per element instead of lower-casing the id
+# and label separately for every keyword test.
+_COUNTRY_RE = re.compile(r"country", re.IGNORECASE)
+_EMAIL_RE = re.compile(r"email", re.IGNORECASE)
+_PHONE_RE = re.compile(r"phone|mobile", re.IGNORECASE)
+_CITY_RE = re.compile(r"city|location", re.IGNORECASE)
+_SUBMITTED_RE = re.compile(r"application was sent|application submitted", re.IGNORECASE)
+
+
+class BrowserSession:
+    """
+    Process-wide Playwright session shared by every application.
+
+    Starting Playwright and launching the persistent context costs seconds;
+    doing it per job would dominate the run. The session is created once on
+    first use (including the one-time login check) and each job only pays
+    for a fresh tab via context.new_page().
+    """
+
+    _instance: Optional["BrowserSession"] = None
+
+    def __init__(self):
+        self._playwright = None
+        self.context = None
+        self.logged_in = False
+
+    @classmethod
+    async def get(cls) -> "BrowserSession":
+        if cls._instance is None:
+            session = cls()
+            session._playwright = await async_playwright().start()
+            session.context = await session._playwright.chromium.launch_persistent_context(
+                USER_DATA_DIR,
+                headless=True,
+            )
+            # Routing disables the HTTP cache, so the filter is kept narrow:
+            # only heavyweight asset types and tracking beacons are dropped.
+            # The avatar login check still works — it waits on the <img>
+            # element's layout box, not on the picture itself loading.
+            await session.context.route("**/*", _block_heavy_requests)
+            page = await session.context.new_page()
+            try:
+                if await is_logged_in(page):
+                    logger.info("Existing LinkedIn session is still valid.")
+                    session.logged_in = True
+                else:
+                    logger.info("No valid LinkedIn session; logging in...")
+                    session.logged_in = await perform_login(page)
+            finally:
+                await page.close()
+            cls._instance = session
+        return cls._instance
+
+    @classmethod
+    async def close(cls):
+        if cls._instance is not None:
+            session, cls._instance = cls._instance, None
+            if session.context:
+                await session.context.close()
+            if session._playwright:
+                await session._playwright.stop()
+
+
+async def is_logged_in(page) -> bool:
+    """
+    Probes the LinkedIn feed to check whether the stored session is valid.
+    """
+    # This navigation is only a login probe — the avatar wait below handles
+    # readiness, so returning at first response commit is enough.
+    await page.goto("https://www.linkedin.com/feed/", wait_until='commit', timeout=45000)
+
+    try:
+        await page.locator(PROFILE_AVATAR).wait_for(state='visible', timeout=10000)
+        return True
+    except PlaywrightTimeoutError:
+        # The two checks are independent; overlap them.
+        login_visible, signin_visible = await asyncio.gather(
+            page.locator("a[href*='login']").is_visible(),
+            page.locator("button:has-text('Sign in')").is_visible(),
+        )
+        if login_visible or signin_visible:
+            return False
+        return False
+
+
+async def perform_login(page) -> bool:
+    """
+    Logs in to LinkedIn with the configured credentials. Returns True on
+    success.
+    """
+    if not config.LINKEDIN_EMAIL or not config.LINKEDIN_PASSWORD:
+        logger.error("LINKEDIN_EMAIL and LINKEDIN_PASSWORD must be set to apply to jobs.")
+        return False
+
+    await page.goto("https://www.linkedin.com/login", wait_until='domcontentloaded', timeout=45000)
+    await page.fill("input#username", config.LINKEDIN_EMAIL)
+    await page.fill("input#password", config.LINKEDIN_PASSWORD)
+    await page.click("button[type='submit']")
+
+    try:
+        # Match checkpoint URLs too, so a verification challenge is reported
+        # immediately instead of burning the full timeout.
+        await page.wait_for_url(_FEED_URL_RE, timeout=25000)
+        if "/checkpoint/" in page.url:
+            logger.error("LinkedIn login hit a verification checkpoint; complete it manually once in a headed run.")
+            return False
+        logger.info("LinkedIn login successful.")
+        return True
+    except PlaywrightTimeoutError:
+        error_visible, captcha_visible = await asyncio.gather(
+            page.locator("div#error-for-password").is_visible(timeout=1000),
+            page.locator("#captcha-internal").is_visible(timeout=1000),
+        )
+        if error_visible:
+            logger.error("LinkedIn login failed: bad credentials.")
+        elif captcha_visible:
+            logger.error("LinkedIn login blocked by a CAPTCHA challenge; complete it manually once in a headed run.")
+        else:
+            logger.error("LinkedIn login did not reach the feed within the timeout.")
+        return False
+
+
+async def find_label_for_element(element_locator) -> Optional[str]:
+    """
+    Resolves a human-readable label for a form element, trying the id-linked
+    <label>, aria-labelledby, aria-label and finally an ancestor <label>.
+    """
+    page = element_locator.page
+
+    # aria-label is the common case on Easy Apply fields; check it first so
+    # the other attribute round-trips usually never happen.
+    aria_label = await element_locator.get_attribute("aria-label")
+    if aria_label:
+        return aria_label.strip()
+
+    labelledby = await element_locator.get_attribute("aria-labelledby")
+    if labelledby:
+        try:
+            label_text = await page.locator(f"#{labelledby}").text_content()
+            if label_text:
+                return label_text.strip()
+        except Exception:
+            pass
+
+    element_id = await element_locator.get_attribute("id")
+    if element_id:
+        try:
+            label_locator = page.locator(f"label[for='{element_id}']")
+            if await label_locator.count() > 0:
+                label_text = await label_locator.first.text_content()
+                if label_text:
+                    return label_text.strip()
+        except Exception:
+            pass
+
+    # Fall back to an enclosing <label> (inputs nested inside their label).
+    # closest('label') is a native DOM call and the value strip happens in
+    # the same evaluate — one hop instead of XPath ancestor walking plus
+    # separate count/text/value round-trips.
+    try:
+        label_text = await element_locator.evaluate(
+            """el => {
+                const label = el.closest('label');
+                if (!label) return '';
+                return label.textContent.replace(el.value || '', '').trim();
+            }"""
+        )
+        if label_text:
+            return label_text
+    except Exception:
+        pass
+
+    return None
+
+
+async def get_llm_answers_for_fields(labels: List[str], job_details: Dict[str, Any]) -> List[Optional[str]]:
+    """
+    Asks the LLM for short answers to the application-form questions we have
+    no hard-coded rule for. All of a step's questions go out in one call —
+    per-field calls would pay request latency once per question.
+
+    Returns one answer per label, None where the question was unanswerable.
+    """
+    if not labels:
+        return []
+
+    questions = "\n".join(f"{i + 1}. {label}" for i, label in enumerate(labels))
+    prompt = f"""You are filling a LinkedIn Easy Apply form for the job below on behalf of the applicant.
+
+Job title: {job_details.get('job_title', '')}
+Company: {job_details.get('company', '')}
+
+Form field questions:
+{questions}
+
+Answer every question with ONLY the text to type into the field — no
+explanation. For yes/no questions answer "Yes" or "No". For numeric
+questions (years of experience, notice period, expected salary) answer
+with a single number. If a question cannot be answered sensibly, answer
+"SKIP".
+
+Expected JSON output structure: {{"answers": ["<answer 1>", "<answer 2>", ...]}}
+Return exactly {len(labels)} answers, in the same order as the questions."""
+    try:
+        response = await asyncio.to_thread(
+            primary_client.generate_content,
+            prompt=prompt,
+            temperature=0.2,
+            response_format=FormAnswersOutput,
+        )
+        answers = FormAnswersOutput.model_validate_json(response).answers
+    except ValidationError as e:
+        logger.error("LLM returned malformed answers for fields %s: %s", labels, e)
+        return [None] * len(labels)
+    except Exception as e:
+        logger.error("LLM answers for fields %s failed: %s", labels, e)
+        return [None] * len(labels)
+
+    normalized: List[Optional[str]] = []
+    for answer in answers[:len(labels)]:
+        answer = (answer or "").strip()
+        normalized.append(answer if answer and answer.upper() != "SKIP" else None)
+    normalized.extend([None] * (len(labels) - len(normalized)))
+    return normalized
+
+
+async def apply_to_job(context, job_details: Dict[str, Any], resume_path: str) -> bool:
+    """
+    Opens the job page in a new tab of the shared context, walks the Easy
+    Apply modal step by step and submits the application. Returns True when
+    the application was submitted.
+
+    The context is owned by the caller (BrowserSession) and outlives every
+    application, so the logged-in session, warm connections and cached
+    static assets carry over; only the page is closed on exit.
+    """
+    job_id = job_details.get("job_id")
+    if not os.path.exists(resume_path):
+        logger.error("Resume file not found at %s; cannot apply.", resume_path)
+        return False
+
+    page = await context.new_page()
+    try:
+        job_url = f"https://www.linkedin.com/jobs/view/{job_id}/"
+        logger.info("Opening job page for job_id %s...", job_id)
+        await page.goto(job_url, wait_until='domcontentloaded', timeout=45000)
+
+        easy_apply_button = page.locator(EASY_APPLY_BUTTON).first
+        try:
+            await easy_apply_button.wait_for(state='visible', timeout=10000)
+        except PlaywrightTimeoutError:
+            logger.info("No Easy Apply button for job_id %s; skipping.", job_id)
+            return False
+        modal_locator = page.locator(EASY_APPLY_MODAL)
+        # click() auto-waits for the button to be enabled; no is_enabled()
+        # precheck round-trip (and race window) needed.
+        try:
+            await easy_apply_button.click(timeout=5000)
+        except PlaywrightTimeoutError:
+            logger.info("Easy Apply button not actionable for job_id %s (already applied?).", job_id)
+            return False
+        # Wait for the first interactive element instead of a fixed pause —
+        # the modal is ready as soon as something is actionable.
+        await modal_locator.locator("button, input, select").first.wait_for(state='visible', timeout=10000)
+
+        # Field ids are stable within a modal, and the same fields reappear
+        # across steps (and on the Review step); resolving their labels once
+        # saves several DOM queries per repeat.
+        label_cache: Dict[str, str] = {}
+
+        # Once a resume card is confirmed selected it stays selected; the
+        # whole resume block is skipped on every later step.
+        resume_handled = False
+
+        # The advance buttons live in the modal footer on every step;
+        # resolve the locator once and classify per step in one query.
+        action_buttons = modal_locator.locator("footer button")
+
+        current_step = 0
+        max_steps = 10
+        while current_step < max_steps:
+            # No modal visibility precheck: if the modal is gone the field
+            # scan comes back empty and the no-actionable-button exit below
+            # ends the loop. Wait for the step's form to render rather than
+            # pausing a fixed second.
+            try:
+                await modal_locator.locator("form").first.wait_for(state='visible', timeout=5000)
+            except PlaywrightTimeoutError:
+                pass
+
+            # --- Resume selection ---
+            # LinkedIn preselects the last used resume; make sure a resume
+            # card is selected, otherwise upload ours.
+            if not resume_handled:
+                resume_section = modal_locator.locator(RESUME_SECTION)
+                if await resume_section.count() > 0:
+                    selected_resume = modal_locator.locator(SELECTED_RESUME_CARD)
+                    if await selected_resume.count() > 0:
+                        selected_filename = await selected_resume.first.locator(RESUME_FILE_NAME).text_content()
+                        logger.info("Resume already selected: %s", (selected_filename or "").strip())
+                        resume_handled = True
+                    else:
+                        # Fast path: click the upload button and hand the
+                        # file to the native chooser, instead of hunting for
+                        # the hidden input[type=file] in the DOM.
+                        uploaded = False
+                        try:
+                            upload_button = modal_locator.get_by_text("Upload resume", exact=False).first
+                            async with page.expect_file_chooser(timeout=5000) as chooser_info:
+                                await upload_button.click()
+                            file_chooser = await chooser_info.value
+                            await file_chooser.set_files(resume_path)
+                            uploaded = True
+                        except PlaywrightTimeoutError:
+                            # Fall back to the DOM input if no chooser opened.
+                            file_input = modal_locator.locator("input[type='file']")
+                            if await file_input.count() > 0:
+                                await file_input.first.set_input_files(resume_path)
+                                uploaded = True
+                        if uploaded:
+                            await modal_locator.locator(SELECTED_RESUME_CARD).first.wait_for(state='visible', timeout=10000)
+                            logger.info("Uploaded resume for job_id %s.", job_id)
+                            resume_handled = True
+
+            # --- Form fields ---
+            # Discover every field's metadata in a single evaluate_all hop,
+            # then iterate in pure Python; a live locator is re-acquired by
+            # index only when a field actually needs an action.
+            fields_locator = modal_locator.locator(INTERACTIVE_FIELDS)
+            field_specs = await fields_locator.evaluate_all(
+                """els => els.map((el, idx) => ({
+                    idx,
+                    tag: el.tagName.toLowerCase(),
+                    type: el.type || 'text',
+                    id: el.id || '',
+                    name: el.name || '',
+                    value: el.value || '',
+                    label: (el.labels && el.labels[0] && el.labels[0].innerText || el.getAttribute('aria-label') || '').trim(),
+                    visible: el.offsetParent !== null && el.getClientRects().length > 0,
+                    editable: !el.disabled && !el.readOnly,
+                }))"""
+            )
+            # Visibility/editability come from the batched snapshot, so a
+            # step with nothing fillable (e.g. the Review step) skips the
+            # loop entirely and jumps straight to the advance buttons.
+            actionable_specs = [
+                spec for spec in field_specs
+                if spec["visible"] and spec["editable"] and spec["type"] not in ("hidden", "file")
+            ]
+
+            # Unknown fields are collected during the pass and answered with
+            # a single LLM call at the end of the step. Radio groups share a
+            # name across their inputs, so each group is handled once.
+            pending_llm_fields: List[Dict[str, Any]] = []
+            handled_radio_groups: set = set()
+
+            for spec in actionable_specs:
+                element = fields_locator.nth(spec["idx"])
+
+                tag = spec["tag"]
+                element_type = spec["type"]
+                element_id = spec["id"]
+
+                # Most labels arrive with the batched snapshot; the per-element
+                # lookup is a fallback for aria-labelledby and enclosing-label
+                # markup that el.labels doesn't cover.
+                cache_key = element_id or spec["name"]
+                if spec["label"]:
+                    label = spec["label"]
+                elif cache_key and cache_key in label_cache:
+                    label = label_cache[cache_key]
+                else:
+                    label = await find_label_for_element(element)
+                    if cache_key and label:
+                        label_cache[cache_key] = label
+                # Single dispatch string per field; the precompiled matchers
+                # do their own case folding.
+                id_label = f"{element_id} {label or ''}"
+
+                if tag == "select":
+                    # Country-code selects: pick the configured location.
+                    if _COUNTRY_RE.search(id_label):
+                        # ~250 options: read them all in one evaluate rather
+                        # than one text_content round-trip per option.
+                        option_texts = await element.evaluate(
+                            "sel => Array.from(sel.options, o => o.text.trim())"
+                        )
+                        matched_text = next(
+                            (text for text in option_texts if text.startswith(config.LINKEDIN_LOCATION)),
+                            None,
+                        )
+                        if matched_text:
+                            await element.select_option(label=matched_text)
+                    continue
+
+                if element_type in ("radio", "checkbox"):
+                    if element_type == "checkbox":
+                        continue
+                    group_name = spec["name"]
+                    if not group_name or group_name in handled_radio_groups:
+                        continue
+                    handled_radio_groups.add(group_name)
+                    radio_group_locator = modal_locator.locator(
+                        f"input[type='radio'][name='{group_name}']"
+                    )
+                    # One evaluate_all returns the whole group's option
+                    # metadata instead of N x 4 attribute round-trips.
+                    radio_meta = await radio_group_locator.evaluate_all(
+                        """els => els.map(e => ({
+                            value: e.value,
+                            checked: e.checked,
+                            label: ((document.querySelector('label[for="' + e.id + '"]') || {}).innerText || e.value || '').trim(),
+                        }))"""
+                    )
+                    if not radio_meta or any(m["checked"] for m in radio_meta):
+                        continue
+                    option_labels = [m["label"] for m in radio_meta]
+                    pending_llm_fields.append({
+                        "label": f"{label} (answer with exactly one of: {', '.join(option_labels)})",
+                        "radio_locator": radio_group_locator,
+                        "options": option_labels,
+                    })
+                    continue
+
+                # Current values come from the batched snapshot too — no
+                # input_value() round-trip just to find a field prefilled.
+                if _EMAIL_RE.search(id_label):
+                    if spec["value"] != config.LINKEDIN_EMAIL:
+                        await element.fill(config.LINKEDIN_EMAIL)
+                    continue
+
+                if _PHONE_RE.search(id_label):
+                    # Usually prefilled from the profile; leave as is.
+                    continue
+
+                if _CITY_RE.search(id_label):
+                    if spec["value"].strip():
+                        continue
+                    await element.fill(config.LINKEDIN_LOCATION)
+                    # expect() assertions poll in the driver and absorb the
+                    # typeahead's debounce; no fixed pauses anywhere here.
+                    dropdown_locator = page.locator(CITY_TYPEAHEAD_DROPDOWN)
+                    try:
+                        await expect(dropdown_locator).to_be_visible(timeout=8000)
+                        # One RPC for all suggestion texts instead of one
+                        # text_content round-trip per node.
+                        suggestion_texts = [
+                            text.strip()
+                            for text in await dropdown_locator.locator(CITY_TYPEAHEAD_OPTION).all_text_contents()
+                            if text.strip()
+                        ]
+                        logger.info("City suggestions: %s", suggestion_texts)
+                        # Role-based lookup goes through the accessibility
+                        # tree instead of scanning every text node, and the
+                        # click auto-waits — no separate visibility wait.
+                        target_click_element = dropdown_locator.get_by_role(
+                            "option", name=config.LINKEDIN_LOCATION
+                        ).first
+                        await target_click_element.click(timeout=5000)
+                        await expect(dropdown_locator).to_be_hidden(timeout=5000)
+                    except (AssertionError, PlaywrightTimeoutError):
+                        logger.warning("City typeahead did not settle for job_id %s.", job_id)
+                    continue
+
+                # Unknown field: queue it for the batched LLM call unless it
+                # already holds a value.
+                if label and not spec["value"].strip():
+                    pending_llm_fields.append({"label": label, "fill_idx": spec["idx"]})
+
+            if pending_llm_fields:
+                answers = await get_llm_answers_for_fields(
+                    [field["label"] for field in pending_llm_fields], job_details
+                )
+                for field, answer in zip(pending_llm_fields, answers):
+                    if not answer:
+                        continue
+                    if "fill_idx" in field:
+                        await fields_locator.nth(field["fill_idx"]).fill(answer)
+                    else:
+                        matched = next(
+                            (i for i, option in enumerate(field["options"])
+                             if option.lower() == answer.lower()),
+                            None,
+                        )
+                        if matched is not None:
+                            await field["radio_locator"].nth(matched).check()
+
+            # --- Step advance ---
+            # One evaluate_all classifies every footer button in a single
+            # round-trip; a live locator is re-acquired by index only for
+            # the button that actually gets clicked.
+            buttons_meta = await action_buttons.evaluate_all(
+                """els => els.map(b => ({
+                    text: b.innerText.trim().toLowerCase(),
+                    enabled: !b.disabled,
+                    visible: !!b.offsetParent,
+                }))"""
+            )
+
+            def _find_button(needle: str) -> Optional[int]:
+                return next(
+                    (i for i, b in enumerate(buttons_meta) if b["visible"] and needle in b["text"]),
+                    None,
+                )
+
+            submit_idx = _find_button("submit application")
+            if submit_idx is not None:
+                if buttons_meta[submit_idx]["enabled"]:
+                    await action_buttons.nth(submit_idx).click()
+                    try:
+                        await modal_locator.wait_for(state='hidden', timeout=10000)
+                    except PlaywrightTimeoutError:
+                        pass
+                    confirmation = await page.content()
+                    if _SUBMITTED_RE.search(confirmation):
+                        logger.info("Application submitted for job_id %s.", job_id)
+                    else:
+                        logger.info("Submitted application for job_id %s (no confirmation banner found).", job_id)
+                    return True
+                logger.warning("Submit button present but disabled for job_id %s.", job_id)
+                return False
+
+            advanced = False
+            for needle in ("review", "next", "continue"):
+                idx = _find_button(needle)
+                if idx is not None and buttons_meta[idx]["enabled"]:
+                    # Race the step transition against a validation error:
+                    # on success LinkedIn swaps the form out (the old element
+                    # detaches), on rejection an inline error toast appears
+                    # and the step never advances. Arming both before the
+                    # click lets the loop move at UI-event speed and abort
+                    # a rejected step instead of spinning until max_steps.
+                    try:
+                        form_handle = await modal_locator.locator("form").first.element_handle(timeout=2000)
+                    except PlaywrightTimeoutError:
+                        form_handle = None
+                    if form_handle is None:
+                        await action_buttons.nth(idx).click()
+                    else:
+                        advance_fut = asyncio.create_task(
+                            form_handle.wait_for_element_state("hidden", timeout=15000)
+                        )
+                        error_fut = asyncio.create_task(
+                            modal_locator.locator(VALIDATION_ERROR).first.wait_for(state='visible', timeout=15000)
+                        )
+                        await action_buttons.nth(idx).click()
+                        done, pending = await asyncio.wait(
+                            {advance_fut, error_fut},
+                            return_when=asyncio.FIRST_COMPLETED,
+                            timeout=15,
+                        )
+                        for fut in pending:
+                            fut.cancel()
+                        if error_fut in done and error_fut.exception() is None:
+                            logger.warning(
+                                "Validation errors on step %s for job_id %s; aborting.",
+                                current_step, job_id,
+                            )
+                            return False
+                    current_step += 1
+                    advanced = True
+                    break
+            if advanced:
+                continue
+
+            logger.warning("No actionable button found on step %s for job_id %s; aborting.", current_step, job_id)
+            break
+
+        return False
+
+    except Exception as e:
+        logger.error("Error applying to job_id %s: %s", job_id, e, exc_info=True)
+        return False
+    finally:
+        await page.close()
+
+
+async def main():
+    """
+    Fetches the top-scored jobs and applies to them through the shared
+    browser session.
+    """
+    jobs_to_apply = await asyncio.to_thread(
+        supabase_utils.get_top_scored_jobs_to_apply, config.JOBS_TO_APPLY_PER_RUN
+    )
+    if not jobs_to_apply:
+        logger.info("No jobs ready for application.")
+        return
+
+    resume_bytes = await asyncio.to_thread(supabase_utils.download_resume_from_storage)
+    if not resume_bytes:
+        logger.error("Could not download the resume PDF; aborting.")
+        return
+    with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as resume_file:
+        resume_file.write(resume_bytes)
+        resume_path = resume_file.name
+
+    session = await BrowserSession.get()
+    if not session.logged_in:
+        logger.error("Not logged in to LinkedIn; aborting.")
+        await BrowserSession.close()
+        return
+
+    # Pages are isolated, so applications can run in parallel tabs of the
+    # one context; the semaphore keeps the tab count (and LinkedIn's view
+    # of us) bounded. Most per-job time is spent waiting on the browser,
+    # so wall time scales with the concurrency.
+    semaphore = asyncio.Semaphore(config.APPLY_MAX_CONCURRENCY)
+
+    async def apply_one(job_details: Dict[str, Any]) -> bool:
+        async with semaphore:
+            applied = await apply_to_job(session.context, job_details, resume_path)
+        if applied:
+            await asyncio.to_thread(supabase_utils.mark_job_as_applied, job_details.get("job_id"))
+        return applied
+
+    try:
+        results = await asyncio.gather(
+            *(apply_one(job_details) for job_details in jobs_to_apply),
+            return_exceptions=True,
+        )
+        for job_details, result in zip(jobs_to_apply, results):
+            if isinstance(result, Exception):
+                logger.error("Unhandled error applying to job_id %s: %s", job_details.get("job_id"), result)
+    finally:
+        await BrowserSession.close()
+
+    logger.info("Finished application run.")
+
+
+if __name__ == "__main__":
+    logger.info("Script started.")
+    try:
+        asyncio.run(main())
+        logger.info("Job application run completed.")
+    except Exception as e:
+        logger.error("Error during task execution: %s", e, exc_info=True)
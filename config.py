@@ -1,15 +1,42 @@
 import os
-from dotenv import load_dotenv
+from functools import lru_cache
 
-load_dotenv()
+from dotenv import load_dotenv
 
 # --- DO NOT MODIFY THE BELOW SECTION ---
 
 # =================================================================
 # 1. CORE SYSTEM CONFIGURATION (Do Not Modify)
 # =================================================================
-SUPABASE_URL: str = os.environ.get("SUPABASE_URL")
-SUPABASE_SERVICE_ROLE_KEY: str = os.environ.get("SUPABASE_SERVICE_ROLE_KEY")
+
+# Environment-backed settings are resolved lazily (PEP 562) so importing
+# config stays cheap and .env parsing is only paid on first use.
+@lru_cache(maxsize=1)
+def _load_env() -> bool:
+    load_dotenv()
+    return True
+
+def _llm_api_key():
+    return os.environ.get("LLM_API_KEY") or os.environ.get("GEMINI_API_KEY") or os.environ.get("GEMINI_FIRST_API_KEY")
+
+_ENV_SETTINGS = {
+    "SUPABASE_URL": lambda: os.environ.get("SUPABASE_URL"),
+    "SUPABASE_SERVICE_ROLE_KEY": lambda: os.environ.get("SUPABASE_SERVICE_ROLE_KEY"),
+    # API key — set only the key(s) needed for your chosen provider.
+    "LLM_API_KEY": _llm_api_key,
+    # LinkedIn credentials for the Easy Apply automation.
+    "LINKEDIN_EMAIL": lambda: os.environ.get("LINKEDIN_EMAIL"),
+    "LINKEDIN_PASSWORD": lambda: os.environ.get("LINKEDIN_PASSWORD"),
+}
+
+def __getattr__(name: str):
+    if name in _ENV_SETTINGS:
+        _load_env()
+        value = _ENV_SETTINGS[name]()
+        globals()[name] = value  # cache so later lookups skip __getattr__
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 SUPABASE_TABLE_NAME: str = "jobs"
 SUPABASE_CUSTOMIZED_RESUMES_TABLE_NAME = "customized_resumes"
 SUPABASE_STORAGE_BUCKET="personalized_resumes"
@@ -17,9 +44,6 @@ SUPABASE_RESUME_STORAGE_BUCKET="resumes"
 SUPABASE_BASE_RESUME_TABLE_NAME = "base_resume"
 BASE_RESUME_PATH = "resume.json"
 
-# API keys — set only the key(s) needed for your chosen provider.
-LLM_API_KEY = os.environ.get("LLM_API_KEY") or os.environ.get("GEMINI_API_KEY") or os.environ.get("GEMINI_FIRST_API_KEY")
-
 # =================================================================
 # 2. USER PREFERENCES (Editable)
 # =================================================================
@@ -29,6 +53,10 @@ LLM_API_KEY = os.environ.get("LLM_API_KEY") or os.environ.get("GEMINI_API_KEY")
 # Full list of supported models & naming: https://docs.litellm.ai/docs/providers
 LLM_MODEL = "gemini"
 
+# Optional cheaper/faster model for simple tasks like scoring (a single
+# integer output). Set to None to use LLM_MODEL for everything.
+LLM_SCORING_MODEL = None
+
 # --- Search Configuration ---
 LINKEDIN_SEARCH_QUERIES = ["maths lecturer", "statistics lecturer", "maths teacher", "Maths assistant professor", "Maths professor"]
 LINKEDIN_LOCATION = "Singapore"
@@ -44,7 +72,9 @@ CAREERS_FUTURE_SEARCH_EMPLOYMENT_TYPES = ["Full Time"]
 # --- Processing Limits ---
 SCRAPING_SOURCES = ["linkedin"] # "linkedin", "careers_future"
 JOBS_TO_SCORE_PER_RUN = 5
-JOBS_TO_CUSTOMIZE_PER_RUN = 1
+SCORING_BATCH_SIZE = 5 # Jobs scored per LLM call; 1 disables batching
+JOBS_TO_CUSTOMIZE_PER_RUN = 3 # Jobs are customized concurrently per run
+JOBS_TO_APPLY_PER_RUN = 3
 MAX_JOBS_PER_SEARCH = {
     "linkedin": 2,
     "careers_future": 10,
@@ -54,13 +84,31 @@ MAX_JOBS_PER_SEARCH = {
 # 3. ADVANCED SYSTEM SETTINGS (Modify with Caution)
 # =================================================================
 LLM_MAX_RPM = 10
+# Descriptions longer than this are truncated before scoring so oversized
+# postings can't blow the model context (~4 chars per token heuristic).
+SCORING_MAX_DESCRIPTION_CHARS = 20000
+# Max LLM requests in flight at once (callers may dispatch concurrently).
+LLM_MAX_CONCURRENCY = 4
+# Parallel Easy Apply tabs in the shared browser context. Kept modest so
+# the activity still looks like a person using one browser.
+APPLY_MAX_CONCURRENCY = 2
 LLM_MAX_RETRIES = 3
 LLM_RETRY_BASE_DELAY = 10
 LLM_DAILY_REQUEST_BUDGET = 0
-LLM_REQUEST_DELAY_SECONDS = 8
 
-LINKEDIN_MAX_START = 1 
+# Seconds between resume-generation cycles when the script runs as a
+# long-lived process, keeping connection pools and caches warm. 0 runs a
+# single cycle and exits — the mode the GitHub Actions / cron schedules use.
+RESUME_CYCLE_INTERVAL_SECONDS = 0
+
+LINKEDIN_MAX_START = 1
 REQUEST_TIMEOUT = 30
+
+# Politeness delay ranges in seconds, kept as (min, max) tuples so fresh
+# jitter is sampled per request — never pre-sampled at import time.
+LINKEDIN_PAGE_DELAY_RANGE = (5.0, 15.0)
+LINKEDIN_DETAIL_DELAY_RANGE = (3.0, 10.0)
+ACTIVE_CHECK_DELAY_RANGE = (5.0, 15.0)
 MAX_RETRIES = 3
 RETRY_DELAY_SECONDS = 15
 
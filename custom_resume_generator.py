@@ -5,19 +5,76 @@ import config # Assuming config holds necessary configurations like a default em
 from pydantic import BaseModel, Field, ValidationError # Import pydantic
 from typing import List, Optional, Dict, Any # Import typing helpers
 import json # Import json for parsing LLM output
-import pdf_generator 
-import re
-import asyncio 
+import hashlib
+import pdf_generator
+import asyncio
+import random
+import signal
+import time
+from concurrent.futures import ProcessPoolExecutor
 from llm_client import primary_client
 from models import (
     Education, Experience, Project, Certification, Links, Resume,
-    SummaryOutput, SkillsOutput, ExperienceListOutput, SingleExperienceOutput,
-    ProjectListOutput, SingleProjectOutput, ValidationResponse
+    SummaryOutput, SkillsOutput, ExperienceListOutput,
+    ProjectListOutput
 )
-import time
 import os
 # --- Logging Setup ---
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Job boards are full of reposts and near-identical listings from the same
+# company. Personalized content only depends on (section, job text), so cache
+# results keyed on a normalized hash of the job title + description and skip
+# the LLM entirely when a later job in the run matches. An embedding-based
+# (semantic) key would also catch paraphrased reposts, but needs an embedding
+# call plus a pgvector table per lookup — not worth it until hash misses on
+# near-duplicates show up as a real cost.
+_personalized_section_cache: Dict[tuple, Any] = {}
+
+def _job_cache_key(section_name: str, job_details: Dict[str, Any]) -> tuple:
+    """Cache key for a section's personalized content, tolerant of trivial
+    whitespace/casing differences between reposted listings."""
+    text = f"{job_details.get('job_title', '')}|{job_details.get('description', '')[:2000]}"
+    normalized = " ".join(text.lower().split())
+    return (section_name, hashlib.sha256(normalized.encode("utf-8")).hexdigest())
+
+
+def _find_first_json_span(text: str) -> Optional[tuple]:
+    """
+    Locates the first balanced JSON object or array in text, returning its
+    (start, end) span or None. A single forward pass tracking bracket depth
+    and string state — guaranteed linear time, unlike the lazy `\\{.*?\\}`
+    regexes this replaced, which could backtrack catastrophically on long
+    LLM output with nested braces.
+    """
+    start = -1
+    depth = 0
+    in_string = False
+    escaped = False
+    for i, ch in enumerate(text):
+        if start == -1:
+            if ch in "{[":
+                start = i
+                depth = 1
+            continue
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch in "{[":
+            depth += 1
+        elif ch in "}]":
+            depth -= 1
+            if depth == 0:
+                return (start, i + 1)
+    return None
+
 
 # --- LLM Personalization Function ---
 def extract_json_from_text(text: str) -> str:
@@ -26,86 +83,101 @@ def extract_json_from_text(text: str) -> str:
     Strips markdown formatting (e.g., ```json ... ```), extra whitespace, etc.
     """
 
-    # First, try to find JSON inside markdown code blocks
-    fenced_match = re.search(r"```(?:json)?\s*(\[\s*{.*?}\s*\]|\[.*?\]|\{.*?\})\s*```", text, re.DOTALL)
-    if fenced_match:
-        json_candidate = fenced_match.group(1).strip()
+    # Markdown fences just wrap the JSON; blanking them lets the scanner
+    # below handle fenced and raw output the same way.
+    if "```" in text:
+        text = text.replace("```json", " ").replace("```", " ")
+
+    span = _find_first_json_span(text)
+    if span:
+        json_candidate = text[span[0]:span[1]].strip()
     else:
-        # If no fenced block, try to find the first raw JSON object or array
-        loose_match = re.search(r"(\[\s*{.*?}\s*\]|\[.*?\]|\{.*?\})", text, re.DOTALL)
-        if loose_match:
-            json_candidate = loose_match.group(1).strip()
-        else:
-            # Fallback to the entire string if nothing found
-            json_candidate = text.strip()
+        # Fallback to the entire string if nothing found
+        json_candidate = text.strip()
 
-    # Optional: validate it's parsable
+    # Validate it's parsable, but return the substring as-is — callers
+    # re-parse it anyway, so a pretty-print roundtrip would be wasted work.
     try:
-        parsed = json.loads(json_candidate)
-        return json.dumps(parsed, indent=2)  # return clean, pretty version
+        json.loads(json_candidate)
+        return json_candidate
     except json.JSONDecodeError as e:
         raise ValueError(f"Failed to extract valid JSON: {e}\nRaw candidate:\n{json_candidate}")
 
 
-async def personalize_section_with_llm(
-    section_name: str,
-    section_content: Any,
-    full_resume: Resume,
-    job_details: Dict[str, Any]
-    ) -> Any:
+def build_resume_contexts(base_resume_details: Resume) -> Dict[str, str]:
     """
-    Uses Gemini Flash 2.0 to personalize a specific section of the resume for the given job.
+    Serializes a trimmed resume context string for each personalizable
+    section. Dumping the Pydantic tree once and slicing the dict is much
+    cheaper than a model_dump per section per call, and each section only
+    gets the parts its instructions actually draw on — shipping the full
+    resume to every prompt inflates input tokens several-fold on long
+    resumes.
     """
-    if not section_content or section_content == "NA":
-        logging.warning(f"Skipping personalization for empty or 'NA' section: {section_name}")
-        return section_content # Return original if empty or NA
-
-    output_model_map = {
-        "summary": (SummaryOutput, "summary"),
-        "skills": (SkillsOutput, "skills"),
-        "experience": (SingleExperienceOutput, "experience"),
-        "projects": (SingleProjectOutput, "project"),
+    base_dump = base_resume_details.model_dump()
+
+    experience_outline = [
+        {"job_title": e.get("job_title", ""), "company": e.get("company", "")}
+        for e in base_dump.get("experience", [])
+    ]
+    project_outline = [
+        {"name": p.get("name", ""), "technologies": p.get("technologies", [])}
+        for p in base_dump.get("projects", [])
+    ]
+
+    contexts = {
+        # The summary synthesizes the whole resume, so it sees everything.
+        "summary": {k: v for k, v in base_dump.items() if k != "summary"},
+        # Experience/project descriptions draw on the summary, the explicit
+        # skills list, and an outline of the other section — not its full
+        # descriptions.
+        "experience": {
+            "summary": base_dump.get("summary", ""),
+            "skills": base_dump.get("skills", []),
+            "projects": project_outline,
+        },
+        "projects": {
+            "summary": base_dump.get("summary", ""),
+            "skills": base_dump.get("skills", []),
+            "experience": experience_outline,
+        },
+        # Skills curation must see full descriptions (only explicitly
+        # mentioned skills may be listed) but not education/certs/contact.
+        "skills": {
+            "summary": base_dump.get("summary", ""),
+            "experience": base_dump.get("experience", []),
+            "projects": base_dump.get("projects", []),
+        },
     }
-
-    if section_name not in output_model_map:
-        logging.error(f"Unsupported section_name for LLM personalization: {section_name}")
-        return section_content # Fallback for unsupported sections
-
-    OutputModel, output_key = output_model_map[section_name]
-
-    # Prepare full resume context string (excluding the section being personalized)
-    resume_context_dict = full_resume.model_dump(exclude={section_name})
-    # Limit context size if necessary, especially for large fields like experience descriptions
-    # For simplicity here, we convert the whole dict (minus the current section) to string
-    resume_context = json.dumps(resume_context_dict, indent=2)
-
-    # Convert section_content to JSON serializable format if it's a list of models
-    if isinstance(section_content, list) and section_content and hasattr(section_content[0], 'model_dump'):
-        serializable_section_content = [item.model_dump() for item in section_content]
-    else:
-        serializable_section_content = section_content # Assume it's already serializable (like str or list[str])
-
-    prompts = []
-
-    # Construct the prompt based on the section
-    prompt_intro = f"""
+    return {name: json.dumps(ctx, separators=(",", ":")) for name, ctx in contexts.items()}
+
+
+# Prompt templates are built once at import; per-call .format() only
+# interpolates the small variable pieces instead of reconstructing these
+# multi-KB strings from scratch for every section (and every item in the
+# experience/projects loops).
+#
+# Static content (the resume context, identical across every job in a run)
+# goes first and dynamic per-job content last, so providers with implicit
+# prefix caching can reuse the shared prompt head instead of re-prefilling
+# it for every call.
+_PROMPT_INTRO_TMPL = """
     **Task:** Enhance the specified resume section for the target job application.
 
-    **Target Job**
-    - Title: {job_details['job_title']}
-    - Company: {job_details['company']}
-    - Seniority Level: {job_details['level']}
-    - Job Description: {job_details['description']}
+    **Full Resume Context (excluding the section being edited):**
+    {resume_context}
 
     ---
 
-    **Full Resume Context (excluding the section being edited):**
-    {resume_context}
+    **Target Job**
+    - Title: {job_title}
+    - Company: {company}
+    - Seniority Level: {level}
+    - Job Description: {description}
 
     **Resume Section to Enhance:** {section_name}
     """
 
-    system_prompt = f"""
+_PERSONALIZE_SYSTEM_PROMPT = """
     You are an expert resume writer and a precise JSON generation assistant.
     Your primary function is to enhance specified sections of a resume to better align with a target job description, based on the provided resume context and original section content.
 
@@ -123,12 +195,9 @@ async def personalize_section_with_llm(
     You will receive the target job details, full resume context (excluding the section being edited), the specific section name to enhance, its original content, and section-specific instructions. Follow the output format example provided in the user prompt for the structure of the JSON.
     """
 
-    specific_instructions = ""
-
-    if(section_name == "summary"):
-        specific_instructions = f"""
+_SUMMARY_INSTRUCTIONS_TMPL = """
         **Original Content of This Section:**
-        {json.dumps(serializable_section_content, indent=2)}
+        {section_json}
 
         ---
         **Instructions:**
@@ -141,52 +210,42 @@ async def personalize_section_with_llm(
         ---
         **Expected JSON Output Structure:** {{"summary": "A dynamic and results-oriented Software Engineer with X years of experience..."}}
         """
-        prompt = prompt_intro + specific_instructions
-
-        prompts.append(prompt)
 
-    elif(section_name == "experience"):
-        for exp_item_content  in serializable_section_content:
-            specific_instructions = f"""
-             **Original Content of This Specific Experience Item:**
-            {json.dumps(exp_item_content, indent=2)}
+_EXPERIENCE_INSTRUCTIONS_TMPL = """
+            **Original Content of This Section (All Experience Items):**
+            {section_json}
 
             ---
-            **Instructions for this experience item:**
-            - Enhance the 'description' field ONLY. All other fields (job_title, company, dates, etc.) MUST remain UNCHANGED within this specific experience item.
-            - Integrate relevant skills from the "Full Resume Context" (especially any explicit skills list) and keywords from the "Target Job Description" naturally into the description.
+            **Instructions for the experience section:**
+            - Enhance the 'description' field of EACH item ONLY. All other fields (job_title, company, dates, etc.) MUST remain UNCHANGED in every item.
+            - Return ALL items in the same order as provided. Do NOT add, remove, merge, or reorder items.
+            - Integrate relevant skills from the "Full Resume Context" (especially any explicit skills list) and keywords from the "Target Job Description" naturally into each description.
             - Show HOW these skills were applied and what the IMPACT or achievement was. Quantify achievements if possible, based on the original content.
             - Example: Instead of "Used Python for scripting," try "Automated data processing tasks using Python scripts, reducing manual effort by 20%."
             - Do NOT invent skills or experiences. Stick to the candidate's actual background as reflected in the provided materials.
             ---
-            **Expected JSON Output Structure:** {{"experience": {{"job_title": "Original Job Title", "company": "Original Company", "dates": "Original Dates", "description": "Enhanced description...", "location": "Original Location (if present)"}}}}
-            """ 
-            prompt = prompt_intro + specific_instructions
-            prompts.append(prompt)
+            **Expected JSON Output Structure:** {{"experience": [{{"job_title": "Original Job Title", "company": "Original Company", "dates": "Original Dates", "description": "Enhanced description...", "location": "Original Location (if present)"}}, ...]}}
+            """
 
-    elif(section_name == "projects"):
-        for project_item_content  in serializable_section_content:
-            specific_instructions = f"""
-            **Original Content of This Specific Project Item:**
-            {json.dumps(project_item_content, indent=2)}
+_PROJECTS_INSTRUCTIONS_TMPL = """
+            **Original Content of This Section (All Project Items):**
+            {section_json}
 
             ---
-            **Instructions for this project item:**
-            - Enhance the 'description' field ONLY. All other fields (name, technologies, link, etc.) MUST remain UNCHANGED within this specific project item.
-            - Integrate relevant skills from the "Full Resume Context" and keywords from the "Target Job Description" naturally into the description.
+            **Instructions for the projects section:**
+            - Enhance the 'description' field of EACH item ONLY. All other fields (name, technologies, link, etc.) MUST remain UNCHANGED in every item.
+            - Return ALL items in the same order as provided. Do NOT add, remove, merge, or reorder items.
+            - Integrate relevant skills from the "Full Resume Context" and keywords from the "Target Job Description" naturally into each description.
             - Show HOW these skills were applied.
             - Example: Instead of "Project using React," try "Developed a responsive UI for [Project Purpose] using React and Redux, improving user engagement."
             - Do NOT invent skills or experiences.
             ---
-            **Expected JSON Output Structure (for this single project item):** {{"project": {{"name": "Original Project Name", "technologies": ["Tech1", "Tech2"], "description": "Enhanced description...", "link": "Original Link (if present)"}}}}
+            **Expected JSON Output Structure:** {{"projects": [{{"name": "Original Project Name", "technologies": ["Tech1", "Tech2"], "description": "Enhanced description...", "link": "Original Link (if present)"}}, ...]}}
             """
-            prompt = prompt_intro + specific_instructions 
-            prompts.append(prompt)
 
-    elif(section_name == "skills"):
-        specific_instructions = f"""
+_SKILLS_INSTRUCTIONS_TMPL = """
         **Original Content of This Section (Candidate's Initial Skills List):**
-        {json.dumps(serializable_section_content, indent=2)}
+        {section_json}
 
         ---
         **Instructions for Generating the Curated Skills List:**
@@ -208,76 +267,181 @@ async def personalize_section_with_llm(
         ---
         **Expected JSON Output Structure:** {{"skills": ["Python", "JavaScript", "React", "Node.js", "AWS (EC2, S3, Lambda)", "Docker", "Kubernetes", "Agile Methodologies", "CI/CD Pipelines", "SQL", "Git"]}}
         """
-        prompt = prompt_intro + specific_instructions 
-        prompts.append(prompt)
 
-    logging.info(f"Number of prompts: {len(prompts)}")
 
-    responses = []
-    for prompt in prompts:
-        logging.info(f"Sending prompt to Gemini for section: {section_name} with structured output schema.")
+# Bounds LLM fan-out at the event-loop level: with jobs and sections all
+# dispatched concurrently, this stops a large batch from piling up executor
+# threads that would only block on the client's own rate limits anyway.
+_LLM_SEMAPHORE = asyncio.Semaphore(config.LLM_MAX_CONCURRENCY)
 
-        # messages = [
-        # {'role': 'system', 'content': 'You are an expert resume writer. Only rewrite or generate the specified resume section. Never return the full resume or any unrelated content. Output strictly in the JSON format defined by the provided schema. Do not add any explanatory text before or after the JSON object.'},
-        # {'role': 'user', 'content': prompt}
-        # ]
 
-        try:
-            llm_output = primary_client.generate_content(
+async def _generate_content_bounded(**kwargs) -> str:
+    async with _LLM_SEMAPHORE:
+        return await asyncio.to_thread(primary_client.generate_content, **kwargs)
+
+
+# PDF rendering is the one CPU-bound leg of a job, so it runs on a process
+# pool instead of a worker thread — the GIL would otherwise serialize the
+# renders of concurrently processed jobs. Created lazily so importing this
+# module (e.g. for extract_json_from_text) never forks workers.
+_pdf_pool: Optional[ProcessPoolExecutor] = None
+
+def _get_pdf_pool() -> ProcessPoolExecutor:
+    global _pdf_pool
+    if _pdf_pool is None:
+        workers = max(1, min(config.JOBS_TO_CUSTOMIZE_PER_RUN, os.cpu_count() or 1))
+        _pdf_pool = ProcessPoolExecutor(max_workers=workers)
+    return _pdf_pool
+
+
+# Each section's shape is known up front, so serialization dispatches on the
+# section name rather than probing items with hasattr at runtime.
+_SECTION_SERIALIZERS = {
+    "summary": lambda content: content,
+    "skills": lambda content: list(content),
+    "experience": lambda content: [item.model_dump() for item in content],
+    "projects": lambda content: [item.model_dump() for item in content],
+}
+
+
+async def personalize_section_with_llm(
+    section_name: str,
+    section_content: Any,
+    job_details: Dict[str, Any],
+    resume_context: Optional[str] = None,
+    full_resume: Optional[Resume] = None
+    ) -> Any:
+    """
+    Uses Gemini Flash 2.0 to personalize a specific section of the resume for the given job.
+    """
+    if not section_content or section_content == "NA":
+        logger.warning("Skipping personalization for empty or 'NA' section: %s", section_name)
+        return section_content # Return original if empty or NA
+
+    output_model_map = {
+        "summary": (SummaryOutput, "summary"),
+        "skills": (SkillsOutput, "skills"),
+        "experience": (ExperienceListOutput, "experience"),
+        "projects": (ProjectListOutput, "projects"),
+    }
+
+    if section_name not in output_model_map:
+        logger.error("Unsupported section_name for LLM personalization: %s", section_name)
+        return section_content # Fallback for unsupported sections
+
+    OutputModel, output_key = output_model_map[section_name]
+
+    cache_key = _job_cache_key(section_name, job_details)
+    if cache_key in _personalized_section_cache:
+        logger.info("Reusing cached personalized content for section %s (duplicate/reposted job).", section_name)
+        return _personalized_section_cache[cache_key]
+
+    # Resume context string (the trimmed resume view for this section).
+    # Callers on the hot path precompute it via build_resume_contexts and
+    # pass only the string; full_resume exists for standalone invocations.
+    if resume_context is None:
+        if full_resume is None:
+            raise ValueError("personalize_section_with_llm needs either resume_context or full_resume")
+        resume_context = build_resume_contexts(full_resume)[section_name]
+
+    # Convert section_content to a JSON-serializable form
+    serializable_section_content = _SECTION_SERIALIZERS[section_name](section_content)
+
+    prompts = []
+
+    # Construct the prompt based on the section; the templates are module
+    # constants, so only the variable pieces are interpolated here.
+    prompt_intro = _PROMPT_INTRO_TMPL.format(
+        resume_context=resume_context,
+        job_title=job_details['job_title'],
+        company=job_details['company'],
+        level=job_details['level'],
+        description=job_details['description'],
+        section_name=section_name,
+    )
+
+    system_prompt = _PERSONALIZE_SYSTEM_PROMPT
+
+    if(section_name == "summary"):
+        section_json = json.dumps(serializable_section_content, separators=(",", ":"))
+        prompts.append(prompt_intro + _SUMMARY_INSTRUCTIONS_TMPL.format(section_json=section_json))
+
+    elif(section_name == "experience"):
+        # All items go in one call with a list-output schema; per-item calls
+        # paid network + prefill overhead N times for the same context.
+        section_json = json.dumps(serializable_section_content, separators=(",", ":"))
+        prompts.append(prompt_intro + _EXPERIENCE_INSTRUCTIONS_TMPL.format(section_json=section_json))
+
+    elif(section_name == "projects"):
+        section_json = json.dumps(serializable_section_content, separators=(",", ":"))
+        prompts.append(prompt_intro + _PROJECTS_INSTRUCTIONS_TMPL.format(section_json=section_json))
+
+    elif(section_name == "skills"):
+        section_json = json.dumps(serializable_section_content, separators=(",", ":"))
+        prompts.append(prompt_intro + _SKILLS_INSTRUCTIONS_TMPL.format(section_json=section_json))
+
+    logger.debug("Number of prompts: %d", len(prompts))
+
+    # Per-item calls (one per experience/project entry) are independent and
+    # network-bound, so dispatch them all at once instead of serially; the
+    # client's token bucket still paces the actual request starts.
+    logger.info("Sending %s prompt(s) to the LLM for section: %s with structured output schema.", len(prompts), section_name)
+    llm_outputs = await asyncio.gather(
+        *[
+            _generate_content_bounded(
                 prompt=prompt,
                 system_prompt=system_prompt,
-                temperature=1,
                 response_format=OutputModel,
             )
-            
-            logging.info(f"Received response from LLM for section: {section_name}")
+            for prompt in prompts
+        ],
+        return_exceptions=True,
+    )
 
+    responses = []
+    for llm_output in llm_outputs:
+        if isinstance(llm_output, Exception):
+            logger.error("Error calling LLM or processing response for section %s: %s", section_name, llm_output)
+            # Fallback: return original content if any LLM call fails
+            return section_content
+
+        try:
+            # Validate and parse the JSON output against the Pydantic model.
+            # response_format guarantees raw JSON, so the extractor only runs
+            # on the exception path (e.g. a model that wrapped the JSON in
+            # markdown fences despite the schema).
+            parsed_response_model = OutputModel.model_validate_json(llm_output)
+            # Extract the actual content (e.g., the string for summary, list for skills)
+            responses.append(parsed_response_model)
+        except ValidationError as e:
             try:
-                # Validate and parse the JSON output against the Pydantic model
-                parsed_response_model = OutputModel.model_validate_json(llm_output)
-                # Extract the actual content (e.g., the string for summary, list for skills)
+                parsed_response_model = OutputModel.model_validate_json(extract_json_from_text(llm_output))
                 responses.append(parsed_response_model)
-            except ValidationError as e:
-                logging.error(f"Failed to validate LLM JSON output for {section_name} against schema: {e}")
-                logging.error(f"LLM Raw Output was for {section_name}: {llm_output}")
+                logger.warning("LLM output for %s required JSON extraction before validating.", section_name)
+            except (ValidationError, ValueError):
+                logger.error("Failed to validate LLM JSON output for %s against schema: %s", section_name, e)
+                logger.error("LLM Raw Output was for %s: %s", section_name, llm_output)
                 # Fallback: return original content if validation fails
                 return section_content
-            except json.JSONDecodeError as e: # Should be caught by ValidationError mostly, but as a safeguard
-                logging.error(f"Failed to parse LLM JSON output for {section_name}: {e}")
-                logging.error(f"LLM Raw Output was for {section_name}: {llm_output}")
-                return section_content
 
+    logger.info("Received %s responses from the LLM for section: %s", len(responses), section_name)
 
-        except Exception as e:
-            logging.error(f"Error calling LLM or processing response for section {section_name}: {e}")
-            # Fallback: return original content if LLM call fails
-            return section_content
+    # Every section is now a single call, list sections included.
+    result = getattr(responses[0], output_key)
 
-    logging.info(f"Received {len(responses)} responses from Gemini for section: {section_name}")
+    _personalized_section_cache[cache_key] = result
+    return result
 
-    if(section_name == "summary"):
-        return getattr(responses[0], output_key)
-    elif(section_name == "skills"):
-        return getattr(responses[0], output_key)
-    elif(section_name == "experience"):
-        experience_list = []
-        for response in responses:
-            experience_list.append(getattr(response, output_key))
-        return experience_list
-    elif(section_name == "projects"):
-        project_list = []
-        for response in responses:
-            project_list.append(getattr(response, output_key))
-        return project_list
-
-async def validate_customization(
-    section_name: str, 
-    original_content: Any, 
+def validate_customization(
+    section_name: str,
+    original_content: Any,
     customized_content: Any
 ) -> tuple[bool, str]:
     """
     Programmatically validates that the customized content hasn't altered
     core facts like job titles, dates, companies, or project details.
+    Pure local comparisons — no LLM round-trip, so it's a plain sync
+    function.
     """
     if not original_content or not customized_content:
         return True, "Empty content, nothing to validate."
@@ -291,8 +455,8 @@ async def validate_customization(
 
         for orig, cust in zip(original_content, customized_content):
             # Extract dict if it's a Pydantic model
-            o_dict = orig.model_dump() if hasattr(orig, 'model_dump') else orig
-            c_dict = cust.model_dump() if hasattr(cust, 'model_dump') else cust
+            o_dict = orig.model_dump() if isinstance(orig, BaseModel) else orig
+            c_dict = cust.model_dump() if isinstance(cust, BaseModel) else cust
 
             # Check core fields haven't changed
             for field in ['job_title', 'company', 'dates', 'location']:
@@ -311,8 +475,8 @@ async def validate_customization(
             return False, f"Projects count changed from {len(original_content)} to {len(customized_content)}."
 
         for orig, cust in zip(original_content, customized_content):
-            o_dict = orig.model_dump() if hasattr(orig, 'model_dump') else orig
-            c_dict = cust.model_dump() if hasattr(cust, 'model_dump') else cust
+            o_dict = orig.model_dump() if isinstance(orig, BaseModel) else orig
+            c_dict = cust.model_dump() if isinstance(cust, BaseModel) else cust
 
             for field in ['name', 'link']:
                 o_val = str(o_dict.get(field, '')).strip()
@@ -333,22 +497,73 @@ async def validate_customization(
     return True, f"Validation passed (no strict checks for {section_name})."
 
 
+async def personalize_and_validate(
+    section_name: str,
+    section_content: Any,
+    job_details: Dict[str, Any],
+    resume_context: str
+) -> tuple[str, Any, bool, str]:
+    """
+    Personalizes one section and validates the result, returning
+    (section_name, personalized_content, is_valid, reason).
+    """
+    personalized_content = await personalize_section_with_llm(
+        section_name,
+        section_content,
+        job_details,
+        resume_context=resume_context
+    )
+    is_valid, reason = validate_customization(
+        section_name,
+        section_content,
+        personalized_content
+    )
+    return section_name, personalized_content, is_valid, reason
+
+
+async def _remote_call_with_retry(description: str, func, *args, attempts: int = 4):
+    """
+    Runs a blocking remote call on a worker thread, retrying with exponential
+    backoff and jitter. The supabase_utils helpers swallow their own
+    exceptions and signal failure with a falsy return, so both exceptions
+    and falsy results count as a failed attempt. A single network blip
+    otherwise abandons the job's finished LLM work until the next cycle.
+    """
+    delay = 1.0
+    for attempt in range(1, attempts + 1):
+        try:
+            result = await asyncio.to_thread(func, *args)
+            if result:
+                return result
+            logger.warning("%s returned no result (attempt %d/%d).", description, attempt, attempts)
+        except Exception as e:
+            logger.warning("%s failed (attempt %d/%d): %s", description, attempt, attempts, e)
+        if attempt < attempts:
+            await asyncio.sleep(delay + random.uniform(0, delay))
+            delay *= 2
+    return None
+
+
 # --- Main Processing Logic ---
-async def process_job(job_details: Dict[str, Any], base_resume_details: Resume):
+async def process_job(
+    job_details: Dict[str, Any],
+    base_resume_details: Resume,
+    resume_contexts: Optional[Dict[str, str]] = None
+):
     """
     Processes a single job: personalizes resume, generates PDF, uploads, updates status.
+    The batch driver passes resume_contexts built once for the whole run.
     """
     job_id = job_details.get("job_id")
     if not job_id:
-        logging.error("Job details missing job_id.")
+        logger.error("Job details missing job_id.")
         return
 
-    logging.info(f"--- Starting processing for job_id: {job_id} ---")
+    logger.info("--- Starting processing for job_id: %s ---", job_id)
 
     try:
         # 1. Personalize Resume Sections
         personalized_resume_data = base_resume_details.model_copy(deep=True) # Create a copy for this job
-        any_validation_failed = False
 
         sections_to_personalize = {
             "summary": base_resume_details.summary,
@@ -357,167 +572,265 @@ async def process_job(job_details: Dict[str, Any], base_resume_details: Resume):
             "skills": base_resume_details.skills,
         }
 
-        sleep_time = config.LLM_REQUEST_DELAY_SECONDS
+        # The context strings depend only on the base resume, so the batch
+        # driver builds them once per cycle; recompute only when called
+        # standalone.
+        if resume_contexts is None:
+            resume_contexts = build_resume_contexts(base_resume_details)
 
+        # The four sections are independent, so personalize + validate them
+        # concurrently instead of one after another.
+        tasks = []
         for section_name, section_content in sections_to_personalize.items():
-            if any_validation_failed: # If a previous section failed validation, skip further personalization
-                logging.warning(f"Skipping further personalization for job_id {job_id} due to prior validation failure.")
-                break # Exit the loop over sections
-
             if section_content and section_content != "NA":
-                logging.info(f"Waiting for {sleep_time} seconds before next request...")
-                time.sleep(sleep_time)
-
-                logging.info(f"Personalizing section: {section_name} for job_id: {job_id}")
-                personalized_content = await personalize_section_with_llm(
+                logger.info("Personalizing section: %s for job_id: %s", section_name, job_id)
+                tasks.append(personalize_and_validate(
                     section_name,
                     section_content,
-                    base_resume_details, # Pass the original full resume for context
-                    job_details # Pass the specific job details
-                )
-
-                # Validate the customization programmatically
-                logging.info(f"Validating customization for section: {section_name} for job_id: {job_id}")
-                is_valid, reason = await validate_customization(
-                    section_name,
-                    section_content,
-                    personalized_content
-                )
-
-                if is_valid:
-                    logging.info(f"Customization for section {section_name} is valid. Reason: {reason}")
-                    # Set the personalized content
-                    setattr(personalized_resume_data, section_name, personalized_content)
-                    # Update the copied resume data
-                    sections_to_personalize[section_name] = personalized_content
-                else:
-                    logging.warning(f"VALIDATION FAILED for section {section_name} for job_id {job_id}. Reason: {reason}")
-                    logging.warning(f"Falling back to original {section_name} content for job_id {job_id}.")
-                    # Note: We NO LONGER abort the entire job generation here. 
-                    # We just skip updating the personalized_resume_data for this section, effectively falling back.
-                    # any_validation_failed = True 
-                    # break;  
-
-                logging.info(f"Finished processing section: {section_name} for job_id: {job_id}")
+                    job_details, # Pass the specific job details
+                    resume_context=resume_contexts[section_name]
+                ))
             else:
-                 logging.info(f"Skipping empty section: {section_name} for job_id: {job_id}")
+                logger.info("Skipping empty section: %s for job_id: %s", section_name, job_id)
 
-        # --- Check if any validation failed before proceeding ---
-        if any_validation_failed:
-            logging.info(f"--- Aborting PDF generation and further processing for job_id: {job_id} due to validation failure. ---")
-            return 
+        for section_name, personalized_content, is_valid, reason in await asyncio.gather(*tasks):
+            if is_valid:
+                logger.info("Customization for section %s is valid. Reason: %s", section_name, reason)
+                # Set the personalized content
+                setattr(personalized_resume_data, section_name, personalized_content)
+            else:
+                logger.warning("VALIDATION FAILED for section %s for job_id %s. Reason: %s", section_name, job_id, reason)
+                logger.warning("Falling back to original %s content for job_id %s.", section_name, job_id)
+                # We don't abort the job here; the section simply keeps its
+                # original content and PDF generation proceeds.
+            logger.info("Finished processing section: %s for job_id: %s", section_name, job_id)
 
         # 2. Generate PDF
-        logging.info(f"Generating PDF for job_id: {job_id}")
+        # The render is CPU-bound, so it goes to the process pool for real
+        # core parallelism; the blocking Supabase calls below stay on worker
+        # threads. Either way the event loop keeps driving the other jobs.
+        logger.info("Generating PDF for job_id: %s", job_id)
         try:
-            pdf_bytes = pdf_generator.create_resume_pdf(personalized_resume_data)
+            pdf_bytes = await asyncio.get_running_loop().run_in_executor(
+                _get_pdf_pool(), pdf_generator.create_resume_pdf, personalized_resume_data
+            )
             if not pdf_bytes:
                  raise ValueError("PDF generation returned empty bytes.")
-            logging.info(f"PDF generation complete for job_id: {job_id}")
+            logger.info("PDF generation complete for job_id: %s", job_id)
         except Exception as e:
-            logging.error(f"Failed to generate PDF for job_id {job_id}: {e}")
+            logger.error("Failed to generate PDF for job_id %s: %s", job_id, e)
             # Skip to the next job if PDF generation fails
             return # Stop processing this job
 
         # 3. Upload PDF to Supabase Storage
         # Construct a unique path, e.g., using job_id
         destination_path = f"resume_{job_id}.pdf"
-        logging.info(f"Uploading PDF to {destination_path} for job_id: {job_id}")
-        resume_path = supabase_utils.upload_customized_resume_to_storage(pdf_bytes, destination_path)
+        logger.info("Uploading PDF to %s for job_id: %s", destination_path, job_id)
+        resume_path = await _remote_call_with_retry(
+            "Resume PDF upload", supabase_utils.upload_customized_resume_to_storage, pdf_bytes, destination_path
+        )
 
         if not resume_path:
-            logging.error(f"Failed to upload resume PDF for job_id: {job_id}")
+            logger.error("Failed to upload resume PDF for job_id: %s", job_id)
             # Skip updating the job record if upload fails
             return # Stop processing this job
 
-        logging.info(f"Successfully uploaded PDF for job_id: {job_id}. Path: {resume_path}")
-
-        # 4. Add Customized Resume to Supabase
-        logging.info("Adding customized resume to Supabase")
-        customized_resume_id = supabase_utils.save_customized_resume(personalized_resume_data, resume_path)
-
-
-        # 4. Update Job Record in Supabase
-        logging.info(f"Updating job record for job_id: {job_id} with resume path.")
-        # Optionally set a new status like "resume_generated" or "ready_to_apply"
-        update_success = supabase_utils.update_job_with_resume_link(job_id, customized_resume_id, new_status="resume_generated")
-
-        if update_success:
-            logging.info(f"Successfully updated job record for job_id: {job_id}")
+        logger.info("Successfully uploaded PDF for job_id: %s. Path: %s", job_id, resume_path)
+
+        # 4. Save Customized Resume and Link it to the Job (single RPC).
+        # Not overlapped with the upload above: inserting a stub row in
+        # parallel and patching in the link afterwards would trade this one
+        # post-upload round-trip for two (insert + patch), a wash on the
+        # critical path while losing the RPC's transactional save+link.
+        # Cross-job overlap already comes from the gather in the cycle.
+        logger.info("Saving customized resume and linking job record for job_id: %s", job_id)
+        customized_resume_id = await _remote_call_with_retry(
+            "Resume save-and-link", supabase_utils.save_and_link_customized_resume,
+            personalized_resume_data, resume_path, job_id
+        )
+
+        if customized_resume_id:
+            logger.info("Successfully saved resume %s and updated job record for job_id: %s", customized_resume_id, job_id)
         else:
-            logging.error(f"Failed to update job record for job_id: {job_id}")
+            logger.error("Failed to update job record for job_id: %s", job_id)
 
-        logging.info(f"--- Finished processing for job_id: {job_id} ---")
+        logger.info("--- Finished processing for job_id: %s ---", job_id)
 
     except Exception as e:
-        logging.error(f"An unexpected error occurred while processing job_id {job_id}: {e}", exc_info=True)
+        logger.error("An unexpected error occurred while processing job_id %s: %s", job_id, e, exc_info=True)
         # Log the error but continue to the next job
 
-async def run_job_processing_cycle():
+# The base resume changes rarely; cache the parsed model with a TTL so a
+# long-lived process skips the Supabase round-trip and Pydantic parsing on
+# every cycle. One-shot (cron/Actions) runs simply never hit the cache.
+_BASE_RESUME_CACHE_TTL_SECONDS = 600
+_base_resume_cache: Optional[tuple] = None  # (expiry_ts, Resume)
+
+
+def _load_base_resume() -> Optional[Resume]:
     """
-    Fetches top jobs and processes them one by one.
+    Loads the base resume from Supabase (with local file fallback), parsed
+    into a Resume model and cached for _BASE_RESUME_CACHE_TTL_SECONDS.
     """
-    logging.info("Starting new job processing cycle...")
+    global _base_resume_cache
+    now = time.monotonic()
+    if _base_resume_cache and _base_resume_cache[0] > now:
+        logger.debug("Using cached base resume.")
+        return _base_resume_cache[1]
 
-    # 1. Retrieve Base Resume Details from Supabase (with local file fallback)
     resume_path = getattr(config, 'BASE_RESUME_PATH', 'resume.json')
-    
+
     # Try fetching resume from Supabase first
     raw_resume_details = supabase_utils.get_base_resume()
-    
+
     if raw_resume_details:
-        logging.info("Successfully loaded base resume from Supabase database.")
+        logger.info("Successfully loaded base resume from Supabase database.")
     elif os.path.exists(resume_path):
-        logging.info(f"Supabase fetch failed. Falling back to local file: {resume_path}")
+        logger.info("Supabase fetch failed. Falling back to local file: %s", resume_path)
         try:
             with open(resume_path, 'r', encoding='utf-8') as f:
                 raw_resume_details = json.load(f)
         except Exception as e:
-            logging.error(f"Failed to read or decode {resume_path}: {e}")
-            return
+            logger.error("Failed to read or decode %s: %s", resume_path, e)
+            return None
     else:
-        logging.error(f"Base resume not found in Supabase or at '{resume_path}'. Please run the 'Parse Resume' workflow first.")
-        return
+        logger.error("Base resume not found in Supabase or at '%s'. Please run the 'Parse Resume' workflow first.", resume_path)
+        return None
 
     if not raw_resume_details:
-        logging.error(f"Could not load valid base resume details. Aborting cycle.")
-        return
-
-    # Parse raw details into Pydantic model
+        logger.error("Could not load valid base resume details.")
+        return None
+
+    # Parse raw details into Pydantic model. Full validation is deliberate
+    # even though the row comes from our own DB: it performs the null→[]
+    # coercion and catches hand-edited resume.json fallbacks, and thanks to
+    # the cache above it runs once per TTL rather than per job — so
+    # model_construct would save nothing worth the lost safety.
     try:
-        # Ensure lists are handled correctly if they are null/None from DB
-        for key in ['skills', 'experience', 'education', 'projects', 'certifications', 'languages']:
-             if raw_resume_details.get(key) is None:
-                 raw_resume_details[key] = []
         base_resume_details = Resume(**raw_resume_details)
-        logging.info("Successfully parsed base resume.")
+        logger.info("Successfully parsed base resume.")
     except Exception as e:
-        logging.error(f"Error parsing base resume details into Pydantic model: {e}")
-        logging.error(f"Raw base resume data: {raw_resume_details}")
-        return # Abort cycle if base resume is invalid
+        logger.error("Error parsing base resume details into Pydantic model: %s", e)
+        logger.error("Raw base resume data: %s", raw_resume_details)
+        return None
+
+    _base_resume_cache = (now + _BASE_RESUME_CACHE_TTL_SECONDS, base_resume_details)
+    return base_resume_details
+
+
+# Batch prefetched during the previous cycle's processing (daemon mode
+# only), so steady-state cycles start without waiting on the job fetch.
+_prefetched_jobs: Optional[list] = None
+
+async def run_job_processing_cycle():
+    """
+    Fetches top jobs and processes them one by one.
+    """
+    global _prefetched_jobs
+    logger.info("Starting new job processing cycle...")
 
-    # 2. Fetch Top Jobs to Process
     jobs_limit = config.JOBS_TO_CUSTOMIZE_PER_RUN
-    logging.info(f"Fetching top {jobs_limit} scored jobs to apply for...")
-    jobs_to_process = supabase_utils.get_top_scored_jobs_for_resume_generation(limit=jobs_limit)
 
-    if not jobs_to_process:
-        logging.info("No new jobs found to process in this cycle.")
+    # 1/2. Retrieve the base resume (cached across cycles) and the jobs to
+    # process. A batch prefetched last cycle is used as-is — it was claimed
+    # (or, on fallback, paged past) behind the batch in flight at the time.
+    # Otherwise the fetch overlaps the resume load — they're independent
+    # round-trips.
+    if _prefetched_jobs:
+        jobs_to_process, _prefetched_jobs = _prefetched_jobs, None
+        logger.info("Using %s jobs prefetched during the previous cycle.", len(jobs_to_process))
+        base_resume_details = await asyncio.to_thread(_load_base_resume)
+    else:
+        logger.info("Fetching top %s scored jobs to apply for...", jobs_limit)
+        base_resume_details, jobs_to_process = await asyncio.gather(
+            asyncio.to_thread(_load_base_resume),
+            asyncio.to_thread(
+                supabase_utils.claim_jobs_for_resume_generation, limit=jobs_limit
+            ),
+        )
+
+    if not base_resume_details:
+        logger.error("Aborting cycle: no valid base resume.")
         return
 
-    logging.info(f"Found {len(jobs_to_process)} jobs to process.")
+    if not jobs_to_process:
+        logger.info("No new jobs found to process in this cycle.")
+        return
 
-    # 3. Process Each Job Sequentially (to avoid overwhelming Gemini/resources)
-    for job_details in jobs_to_process:
-        await process_job(job_details, base_resume_details) # Pass base resume
+    logger.info("Found %s jobs to process.", len(jobs_to_process))
+
+    # The base resume is identical for every job, so its per-section context
+    # strings are built once here rather than once per job.
+    resume_contexts = build_resume_contexts(base_resume_details)
+
+    # In daemon mode, hide next cycle's fetch latency behind this cycle's
+    # LLM calls. The claim RPC skips in-flight jobs by itself; page=2 only
+    # matters on its read-only fallback, where page 1 is exactly the
+    # unclaimed in-flight batch. A short batch means nothing is behind it —
+    # skip the prefetch.
+    prefetch_task = None
+    if config.RESUME_CYCLE_INTERVAL_SECONDS > 0 and len(jobs_to_process) == jobs_limit:
+        prefetch_task = asyncio.create_task(asyncio.to_thread(
+            supabase_utils.claim_jobs_for_resume_generation, limit=jobs_limit, page=2
+        ))
+
+    # 3. Process the jobs concurrently — each job is independent and its
+    # cost is dominated by network I/O (LLM calls, Supabase, storage), so
+    # the batch finishes in roughly the time of the slowest job. The LLM
+    # client's token bucket and semaphore keep the provider load bounded.
+    # process_job handles its own failures; return_exceptions is a safety
+    # net so one crashed job can't cancel the rest of the batch.
+    results = await asyncio.gather(
+        *(process_job(job_details, base_resume_details, resume_contexts) for job_details in jobs_to_process),
+        return_exceptions=True,
+    )
+    for job_details, result in zip(jobs_to_process, results):
+        if isinstance(result, Exception):
+            logger.error("Unhandled error processing job_id %s: %s", job_details.get("job_id"), result)
+
+    if prefetch_task:
+        _prefetched_jobs = await prefetch_task or None
+
+    logger.info("Finished job processing cycle.")
+
+async def main():
+    """
+    Entry coroutine. With RESUME_CYCLE_INTERVAL_SECONDS > 0 this runs as a
+    long-lived daemon, looping cycles on the same event loop so HTTP
+    connection pools, the PDF process pool and the in-process caches stay
+    warm between cycles; 0 keeps the original run-once behavior for the
+    scheduled GitHub Actions / cron mode.
+    """
+    interval = getattr(config, "RESUME_CYCLE_INTERVAL_SECONDS", 0)
+    if interval <= 0:
+        await run_job_processing_cycle()
+        return
 
-    logging.info("Finished job processing cycle.")
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop_event.set)
+        except NotImplementedError:
+            # add_signal_handler is unavailable on some platforms (Windows);
+            # KeyboardInterrupt still stops the loop there.
+            pass
+
+    while not stop_event.is_set():
+        await run_job_processing_cycle()
+        logger.info("Sleeping %s seconds until the next cycle...", interval)
+        try:
+            # Sleep in a way a stop signal can interrupt immediately.
+            await asyncio.wait_for(stop_event.wait(), timeout=interval)
+        except asyncio.TimeoutError:
+            pass
+    logger.info("Stop signal received; exiting cycle loop.")
 
 # --- Script Entry Point ---
 if __name__ == "__main__":
-    logging.info("Script started.")
+    logger.info("Script started.")
     try:
-        asyncio.run(run_job_processing_cycle())
-        logging.info("Rresume processing completed successfully.")
+        asyncio.run(main())
+        logger.info("Rresume processing completed successfully.")
     except Exception as e:
-        logging.error(f"Error during task execution: {e}", exc_info=True)
\ No newline at end of file
+        logger.error("Error during task execution: %s", e, exc_info=True)
\ No newline at end of file
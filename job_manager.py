@@ -1,9 +1,12 @@
 import asyncio
+import atexit
 import httpx
+import queue
 import random
 import time
 from datetime import datetime, timedelta, timezone
 import logging
+from logging.handlers import QueueHandler, QueueListener
 
 # Import shared modules
 import config
@@ -11,7 +14,22 @@ import user_agents
 from supabase_utils import supabase # Use the initialized Supabase client
 
 # --- Setup Logging ---
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+# This script runs many checks concurrently on one event loop, so log
+# records are pushed onto a queue and formatted/written by a background
+# thread — coroutines return from logging calls immediately instead of
+# contending on the handler lock.
+def _setup_queue_logging():
+    log_queue = queue.Queue(-1)
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+    listener = QueueListener(log_queue, handler)
+    listener.start()
+    atexit.register(listener.stop)
+    root = logging.getLogger()
+    root.setLevel(logging.INFO)
+    root.handlers = [QueueHandler(log_queue)]
+
+_setup_queue_logging()
 
 # --- Helper Functions ---
 
@@ -38,9 +56,11 @@ async def _check_single_linkedin_job_active(job_id: str, client: httpx.AsyncClie
 
     while retries <= config.ACTIVE_CHECK_MAX_RETRIES:
         try:
-            sleep_time = random.uniform(5.0, 15.0)
-            logging.info(f"Waiting for {sleep_time:.2f} seconds before next request...")
-            time.sleep(sleep_time)
+            sleep_time = random.uniform(*config.ACTIVE_CHECK_DELAY_RANGE)
+            logging.debug(f"Waiting for {sleep_time:.2f} seconds before next request...")
+            # Must be the async sleep: a blocking time.sleep here parks the
+            # event loop and serializes every concurrently gathered check.
+            await asyncio.sleep(sleep_time)
 
             # Rotate user agent and proxy for each attempt
             user_agent = random.choice(user_agents.USER_AGENTS)
@@ -15,13 +15,18 @@ Usage:
     )
 """
 
+import atexit
+import hashlib
+import json
 import os
+import sqlite3
 import time
 import random
 import logging
 import threading
 from typing import Optional, Any, Type
 
+import httpx
 import litellm
 from pydantic import BaseModel
 
@@ -34,6 +39,138 @@ litellm.suppress_debug_info = True
 if os.environ.get("LLM_DEBUG", "").lower() == "true":
     litellm.set_verbose = True
 
+# Route every completion through one pooled HTTP client so concurrent calls
+# reuse keep-alive connections instead of paying TLS setup per request. The
+# pool is sized comfortably above the RPM cap's realistic concurrency.
+litellm.client_session = httpx.Client(
+    limits=httpx.Limits(max_connections=32, max_keepalive_connections=32),
+    timeout=httpx.Timeout(60.0, connect=5.0),
+)
+# Close the keep-alive connections cleanly when the process exits rather
+# than relying on GC teardown order.
+atexit.register(litellm.client_session.close)
+
+
+def _retry_after_seconds(error: Exception) -> Optional[float]:
+    """
+    Extract a server-provided retry delay from a rate-limit error, if any.
+
+    Providers return precise hints in 'retry-after' or the
+    'x-ratelimit-reset-*' headers; honoring them avoids both undersleeping
+    (wasting a retry) and oversleeping (wasting wall time).
+    """
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+
+    for header in ("retry-after", "x-ratelimit-reset-requests", "x-ratelimit-reset-tokens"):
+        value = headers.get(header)
+        if not value:
+            continue
+        value = str(value).strip().lower()
+        try:
+            # Some providers send durations like "2s" or "250ms".
+            if value.endswith("ms"):
+                return float(value[:-2]) / 1000.0
+            if value.endswith("s"):
+                return float(value[:-1])
+            return float(value)
+        except (TypeError, ValueError):
+            continue  # e.g. an HTTP-date Retry-After; fall back to backoff
+    return None
+
+
+# Rate-limit backoff state persisted across process restarts. When the
+# pipeline runs on a cron every few minutes, a run that ended mid-backoff
+# would otherwise restart fresh and immediately re-trigger 429s.
+_BACKOFF_STATE_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "job-scraper", "llm_backoff_state.json"
+)
+
+
+def _sleep_residual_backoff():
+    """Sleep out any backoff left over from a previous run, if recorded."""
+    try:
+        with open(_BACKOFF_STATE_PATH) as f:
+            state = json.load(f)
+        residual = state.get("next_allowed_at", 0) - time.time()
+    except (OSError, ValueError):
+        return
+    if residual > 0:
+        residual = min(residual, 300)  # Sanity-cap a corrupt/ancient state file
+        logger.info(f"Previous run ended in backoff; sleeping {residual:.1f}s before first request.")
+        time.sleep(residual)
+
+
+def _save_backoff_state(delay: float):
+    """Record when the next request is allowed, surviving process restarts."""
+    try:
+        os.makedirs(os.path.dirname(_BACKOFF_STATE_PATH), exist_ok=True)
+        with open(_BACKOFF_STATE_PATH, "w") as f:
+            json.dump({"next_allowed_at": time.time() + delay}, f)
+    except OSError:
+        pass  # Best-effort; never fail a request over bookkeeping
+
+
+_residual_backoff_checked = False
+
+
+# Exact-match response cache for near-deterministic calls (temperature at or
+# below the threshold). Reruns, retries after a failed upload, and replays of
+# the same job hit the cache in ~1ms instead of paying a multi-second LLM
+# round-trip. Backed by a local SQLite file so hits survive process restarts.
+_PROMPT_CACHE_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "job-scraper", "llm_cache.sqlite3"
+)
+_PROMPT_CACHE_TTL_SECONDS = 7 * 86400
+_CACHEABLE_TEMPERATURE = 0.2
+
+
+def _prompt_cache_key(model, system_prompt, prompt, response_format, temperature) -> str:
+    payload = {
+        "model": model,
+        "system": system_prompt,
+        "prompt": prompt,
+        "schema": response_format.__name__ if response_format else None,
+        "temperature": temperature,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _prompt_cache_get(key: str) -> Optional[str]:
+    try:
+        os.makedirs(os.path.dirname(_PROMPT_CACHE_PATH), exist_ok=True)
+        with sqlite3.connect(_PROMPT_CACHE_PATH) as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache "
+                "(key TEXT PRIMARY KEY, response TEXT, created_at REAL)"
+            )
+            row = conn.execute(
+                "SELECT response, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row and time.time() - row[1] < _PROMPT_CACHE_TTL_SECONDS:
+            return row[0]
+    except (sqlite3.Error, OSError):
+        pass  # Cache is best-effort; never fail a request over it
+    return None
+
+
+def _prompt_cache_put(key: str, response: str):
+    try:
+        os.makedirs(os.path.dirname(_PROMPT_CACHE_PATH), exist_ok=True)
+        with sqlite3.connect(_PROMPT_CACHE_PATH) as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache "
+                "(key TEXT PRIMARY KEY, response TEXT, created_at REAL)"
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, response, created_at) VALUES (?, ?, ?)",
+                (key, response, time.time()),
+            )
+    except (sqlite3.Error, OSError):
+        pass
+
 
 class RateLimiter:
     """Token-bucket rate limiter for requests per minute."""
@@ -79,7 +216,7 @@ class LLMClient:
         max_retries: int = 3,
         retry_base_delay: int = 10,
         daily_budget: int = 0,
-        request_delay: float = 0,
+        max_concurrency: int = 4,
     ):
         """
         Initialize the LLM client.
@@ -91,15 +228,18 @@ class LLMClient:
             max_retries: Max retries on rate-limit errors
             retry_base_delay: Base delay in seconds for exponential backoff
             daily_budget: Max requests per day (0 = unlimited)
-            request_delay: Fixed delay between requests in seconds
+            max_concurrency: Max requests in flight at once
         """
         self.model = model
         self.api_key = api_key
         self.max_retries = max_retries
         self.retry_base_delay = retry_base_delay
         self.daily_budget = daily_budget
-        self.request_delay = request_delay
         self.rate_limiter = RateLimiter(max_rpm)
+        # Callers dispatch calls concurrently (threads via asyncio.to_thread);
+        # this bounds how many hit the provider at once, on top of the token
+        # bucket's per-minute pacing.
+        self._concurrency = threading.Semaphore(max(1, max_concurrency))
 
         # Daily budget tracking
         self._daily_count = 0
@@ -170,7 +310,22 @@ class LLMClient:
         """
         self._check_daily_budget()
 
+        global _residual_backoff_checked
+        if not _residual_backoff_checked:
+            _residual_backoff_checked = True
+            _sleep_residual_backoff()
+
         model = model_override or self.model
+
+        # Near-deterministic calls can be answered from the local cache.
+        cache_key = None
+        if temperature <= _CACHEABLE_TEMPERATURE:
+            cache_key = _prompt_cache_key(model, system_prompt, prompt, response_format, temperature)
+            cached = _prompt_cache_get(cache_key)
+            if cached is not None:
+                logger.debug("Prompt cache hit; skipping LLM call.")
+                return cached
+
         messages = []
 
         if system_prompt:
@@ -207,19 +362,17 @@ class LLMClient:
 
         for attempt in range(max_attempts):
             try:
-                # Rate limiting
+                # Rate limiting — the token bucket paces requests, so no
+                # fixed inter-request delay is needed on top of it.
                 self.rate_limiter.acquire()
 
-                # Fixed inter-request delay
-                if self.request_delay > 0 and attempt == 0:
-                    time.sleep(self.request_delay)
-                    
                 current_model = gemini_pool[pool_index % len(gemini_pool)] if is_dynamic_gemini else model
                 kwargs = base_kwargs.copy()
                 kwargs["model"] = current_model
 
                 logger.debug(f"LLM request attempt {attempt + 1}/{max_attempts} to {current_model}")
-                response = litellm.completion(**kwargs)
+                with self._concurrency:
+                    response = litellm.completion(**kwargs)
 
                 # Track daily usage
                 self._daily_count += 1
@@ -227,7 +380,10 @@ class LLMClient:
                 # Extract text from response
                 content = response.choices[0].message.content
                 if content:
-                    return content.strip()
+                    content = content.strip()
+                    if cache_key:
+                        _prompt_cache_put(cache_key, content)
+                    return content
                 else:
                     logger.warning("LLM returned empty content")
                     return ""
@@ -242,6 +398,15 @@ class LLMClient:
                     "quota", "too many requests", "retry"
                 ])
 
+                # Transient infrastructure errors (5xx, timeouts, dropped
+                # connections) are worth retrying; only permanent errors
+                # (bad request, auth, invalid model) should fail fast.
+                is_transient = not is_rate_limit and any(keyword in error_str for keyword in [
+                    "500", "502", "503", "504", "529",
+                    "timeout", "timed out", "connection error", "connection reset",
+                    "internal server error", "service unavailable", "overloaded",
+                ])
+
                 if is_rate_limit and attempt < max_attempts - 1:
                     if is_dynamic_gemini:
                         pool_index += 1
@@ -251,16 +416,30 @@ class LLMClient:
                             f"(attempt {attempt + 1}/{max_attempts}). Retrying in {delay:.1f}s. Error: {e}"
                         )
                     else:
-                        # Exponential backoff with jitter
-                        delay = self.retry_base_delay * (2 ** attempt) + random.uniform(0, 5)
+                        # Prefer the server's own retry hint; fall back to
+                        # exponential backoff with jitter when it's absent.
+                        server_delay = _retry_after_seconds(e)
+                        if server_delay is not None:
+                            delay = server_delay + random.uniform(0, 0.5)
+                        else:
+                            delay = self.retry_base_delay * (2 ** attempt) + random.uniform(0, 5)
                         logger.warning(
                             f"Rate limit hit (attempt {attempt + 1}/{max_attempts}). "
                             f"Retrying in {delay:.1f}s... Error: {e}"
                         )
+                    _save_backoff_state(delay)
+                    time.sleep(delay)
+                    continue
+                elif is_transient and attempt < max_attempts - 1:
+                    delay = self.retry_base_delay * (2 ** attempt) + random.uniform(0, 5)
+                    logger.warning(
+                        f"Transient LLM error (attempt {attempt + 1}/{max_attempts}). "
+                        f"Retrying in {delay:.1f}s... Error: {e}"
+                    )
                     time.sleep(delay)
                     continue
-                elif not is_rate_limit:
-                    # Non-rate-limit error — don't retry
+                elif not is_rate_limit and not is_transient:
+                    # Permanent error — don't retry
                     logger.error(f"LLM API error (non-retryable) on model {current_model if 'current_model' in locals() else model}: {e}")
                     raise
 
@@ -282,7 +461,7 @@ def _create_client(
         max_retries=config.LLM_MAX_RETRIES,
         retry_base_delay=config.LLM_RETRY_BASE_DELAY,
         daily_budget=config.LLM_DAILY_REQUEST_BUDGET,
-        request_delay=config.LLM_REQUEST_DELAY_SECONDS,
+        max_concurrency=config.LLM_MAX_CONCURRENCY,
     )
 
 
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from typing import List, Optional, Dict, Any
 
 class Education(BaseModel):
@@ -45,6 +45,12 @@ class Resume(BaseModel):
     languages: List[str] = Field(default_factory=list)
     links: Links = Field(default_factory=Links)
 
+    @field_validator('skills', 'education', 'experience', 'projects', 'certifications', 'languages', mode='before')
+    @classmethod
+    def _none_to_empty_list(cls, v):
+        # DB rows store absent sections as NULL rather than empty arrays.
+        return [] if v is None else v
+
 # --- Pydantic models for LLM structured output ---
 class SummaryOutput(BaseModel):
     summary: str
@@ -64,6 +70,16 @@ class ProjectListOutput(BaseModel):
 class SingleProjectOutput(BaseModel):
     project: Project
 
+class JobScore(BaseModel):
+    job_id: str
+    score: int
+
+class JobScoreListOutput(BaseModel):
+    scores: List[JobScore]
+
+class FormAnswersOutput(BaseModel):
+    answers: List[str]
+
 class ValidationResponse(BaseModel):
     is_valid: bool
     reason: str
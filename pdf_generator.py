@@ -15,16 +15,23 @@ def create_resume_pdf(resume_data: Resume) -> bytes:
     Generates an ATS-friendly PDF resume with improved design from the provided Resume data object.
     Returns the PDF content as bytes.
     """
+    # A rendered resume is a few tens of KB, so building it in one in-memory
+    # buffer is the cheap option; platypus needs a seekable target and the
+    # storage upload sends the whole body in one request anyway. Swap in a
+    # SpooledTemporaryFile here if this ever renders multi-hundred-page docs.
     buffer = io.BytesIO()
-    
+
     # Document setup with slightly wider margins for better readability
     doc = SimpleDocTemplate(
-        buffer, 
+        buffer,
         pagesize=letter,
-        leftMargin=0.6*inch, 
+        leftMargin=0.6*inch,
         rightMargin=0.6*inch,
-        topMargin=0.6*inch, 
-        bottomMargin=0.6*inch
+        topMargin=0.6*inch,
+        bottomMargin=0.6*inch,
+        # Deflate content streams explicitly rather than trusting the
+        # rl_config default — smaller uploads and faster future downloads.
+        pageCompression=1
     )
     
     # Create custom styles
@@ -4,6 +4,18 @@ import json
 import models
 from llm_client import primary_client
 
+# Built once at import; per call we only substitute the resume text.
+PARSE_PROMPT_TEMPLATE = """Extract and return the structured resume information from the text below.
+    Only use what is explicitly stated in the text and do not infer or invent any details.
+
+    CRITICAL: If any information is missing or not available in the text, use "NA" for that field.
+    This applies to all fields (e.g., summary, dates, location, links, etc.).
+    Do NOT leave fields empty or use empty strings.
+
+    Resume text:
+    {resume_text}
+    """
+
 def extract_text_from_pdf(pdf_path):
     """
     Extracts text from a given PDF file.
@@ -43,16 +55,7 @@ def parse_resume_with_ai(resume_text):
     """
     print("Processing resume with AI model...")
 
-    prompt = f"""Extract and return the structured resume information from the text below. 
-    Only use what is explicitly stated in the text and do not infer or invent any details.
-    
-    CRITICAL: If any information is missing or not available in the text, use "NA" for that field. 
-    This applies to all fields (e.g., summary, dates, location, links, etc.). 
-    Do NOT leave fields empty or use empty strings.
-
-    Resume text:
-    {resume_text}
-    """
+    prompt = PARSE_PROMPT_TEMPLATE.format(resume_text=resume_text)
 
     response_text = primary_client.generate_content(
         prompt=prompt,
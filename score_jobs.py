@@ -10,10 +10,54 @@ import os
 import config
 import supabase_utils
 from llm_client import primary_client
+from models import JobScoreListOutput
+from pydantic import ValidationError
 
 # --- Setup Logging ---
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# Built once at import; per call we only substitute the dynamic fields.
+SCORING_PROMPT_TEMPLATE = """
+    You are a scoring assistant. You will be given a resume and a job description.
+    Based **only** on the information provided, **return exactly one integer between 0 and 100** (inclusive) that represents the candidate’s suitability for the role.
+    Do **not** return any words, punctuation, or explanation—only the integer.
+
+    --- RESUME ---
+    {resume_text}
+    --- END RESUME ---
+
+    --- JOB DESCRIPTION ---
+    Job Title: {job_title}
+    Company: {job_company}
+    Level: {job_level}
+
+    {job_description}
+    --- END JOB DESCRIPTION ---
+
+    Score (0–100):
+    """
+
+BATCH_SCORING_PROMPT_TEMPLATE = """
+    You are a scoring assistant. You will be given one resume and several job descriptions.
+    For EACH job, based **only** on the information provided, assign an integer score between 0 and 100 (inclusive) that represents the candidate’s suitability for that role.
+    Return a JSON object of the form {{"scores": [{{"job_id": "...", "score": ...}}, ...]}} containing exactly one entry per job, using each job's job_id verbatim.
+
+    --- RESUME ---
+    {resume_text}
+    --- END RESUME ---
+
+    {job_blocks}
+    """
+
+JOB_BLOCK_TEMPLATE = """--- JOB (job_id: {job_id}) ---
+    Job Title: {job_title}
+    Company: {job_company}
+    Level: {job_level}
+
+    {job_description}
+    --- END JOB ---
+    """
+
 # --- Helper Functions ---
 
 def format_resume_to_text(resume_data: Dict[str, Any]) -> str:
@@ -101,6 +145,24 @@ def format_resume_to_text(resume_data: Dict[str, Any]) -> str:
     return "\n".join(lines)
 
 
+def _truncate_description(description: str, job_id: Any = None) -> str:
+    """
+    Caps a job description at the configured character budget before it is
+    embedded in a prompt, so pathological postings can't exceed the model
+    context and burn a round-trip on a 400 error.
+    """
+    if not description:
+        return description
+    limit = config.SCORING_MAX_DESCRIPTION_CHARS
+    if limit and len(description) > limit:
+        logging.warning(
+            f"Description for job_id {job_id} is {len(description)} chars; "
+            f"truncating to {limit} before scoring."
+        )
+        return description[:limit] + "\n[...description truncated...]"
+    return description
+
+
 def get_resume_score_from_ai(resume_text: str, job_details: Dict[str, Any]) -> Optional[int]:
     """
     Sends resume and job details to Gemini to get a suitability score.
@@ -112,35 +174,27 @@ def get_resume_score_from_ai(resume_text: str, job_details: Dict[str, Any]) -> O
 
     job_company = job_details.get('company', 'N/A')
     job_title = job_details.get('job_title', 'N/A')
-    job_description = job_details.get('description', 'N/A')
+    job_description = _truncate_description(job_details.get('description', 'N/A'), job_details.get('job_id'))
     job_level = job_details.get('level', 'N/A')
 
     logging.info(f"Scoring job_id: {job_details.get('job_id')} with job_title: {job_title} and job_level: {job_level}")
 
-    prompt = f"""
-    You are a scoring assistant. You will be given a resume and a job description.  
-    Based **only** on the information provided, **return exactly one integer between 0 and 100** (inclusive) that represents the candidate’s suitability for the role.  
-    Do **not** return any words, punctuation, or explanation—only the integer.
-
-    --- RESUME ---
-    {resume_text}
-    --- END RESUME ---
-
-    --- JOB DESCRIPTION ---
-    Job Title: {job_title}
-    Company: {job_company}
-    Level: {job_level}
-
-    {job_description}
-    --- END JOB DESCRIPTION ---
-
-    Score (0–100):
-    """
+    prompt = SCORING_PROMPT_TEMPLATE.format(
+        resume_text=resume_text,
+        job_title=job_title,
+        job_company=job_company,
+        job_level=job_level,
+        job_description=job_description,
+    )
 
     try:
         logging.info(f"Requesting score for job_id: {job_details.get('job_id')}")
+        # Scoring only needs a single integer back, so a cheaper/faster
+        # model can be configured for it without quality risk.
         score_text = primary_client.generate_content(
             prompt=prompt,
+            temperature=0,  # Scoring is deterministic; keeps reruns cacheable
+            model_override=config.LLM_SCORING_MODEL,
         )
 
         # Attempt to parse the score
@@ -159,6 +213,66 @@ def get_resume_score_from_ai(resume_text: str, job_details: Dict[str, Any]) -> O
         return None
 
 
+def get_resume_scores_from_ai_batch(resume_text: str, jobs: list) -> Dict[str, int]:
+    """
+    Scores several jobs against the same resume in a single LLM call using a
+    multi-job prompt with a structured list output. Falls back to per-job
+    scoring if the batched response is unusable.
+    Returns a dict mapping job_id -> score for every job that was scored.
+    """
+    if not resume_text or not jobs:
+        return {}
+
+    job_blocks = []
+    for job in jobs:
+        job_blocks.append(JOB_BLOCK_TEMPLATE.format(
+            job_id=job.get('job_id'),
+            job_title=job.get('job_title', 'N/A'),
+            job_company=job.get('company', 'N/A'),
+            job_level=job.get('level', 'N/A'),
+            job_description=_truncate_description(job.get('description', 'N/A'), job.get('job_id')),
+        ))
+
+    prompt = BATCH_SCORING_PROMPT_TEMPLATE.format(
+        resume_text=resume_text,
+        job_blocks="\n".join(job_blocks),
+    )
+
+    expected_ids = {str(job.get('job_id')) for job in jobs}
+
+    try:
+        logging.info(f"Requesting scores for {len(jobs)} jobs in one batched LLM call...")
+        response_text = primary_client.generate_content(
+            prompt=prompt,
+            temperature=0,  # Scoring is deterministic; keeps reruns cacheable
+            response_format=JobScoreListOutput,
+            model_override=config.LLM_SCORING_MODEL,
+        )
+        parsed = JobScoreListOutput.model_validate_json(response_text)
+
+        scores = {}
+        for entry in parsed.scores:
+            if entry.job_id not in expected_ids:
+                logging.warning(f"Batch scoring returned unknown job_id '{entry.job_id}'. Ignoring.")
+                continue
+            if 0 <= entry.score <= 100:
+                scores[entry.job_id] = entry.score
+            else:
+                logging.warning(f"Batch scoring returned out-of-range score {entry.score} for job_id {entry.job_id}. Ignoring.")
+
+        missing = expected_ids - set(scores.keys())
+        if missing:
+            logging.warning(f"Batch scoring missed {len(missing)} job(s); falling back to per-job scoring for them.")
+        return scores
+
+    except (ValidationError, ValueError) as e:
+        logging.error(f"Failed to parse batched scoring response: {e}. Falling back to per-job scoring.")
+        return {}
+    except Exception as e:
+        logging.error(f"Error calling LLM for batched scoring: {e}. Falling back to per-job scoring.")
+        return {}
+
+
 def extract_text_from_pdf_url(pdf_url: str) -> Optional[str]:
     """
     Downloads a PDF from a URL and extracts text from it.
@@ -211,6 +325,7 @@ def rescore_jobs_with_custom_resume():
     logging.info(f"Processing {len(jobs_to_rescore)} jobs for re-scoring...")
     successful_rescores = 0
     failed_rescores = 0
+    pending_score_updates = []
 
     for i, job in enumerate(jobs_to_rescore):
         job_id = job.get('job_id')
@@ -244,25 +359,23 @@ def rescore_jobs_with_custom_resume():
         if not custom_resume_text:
             logging.error(f"Failed to obtain custom resume text for job_id {job_id} from both DB and PDF. Skipping.")
             failed_rescores += 1
-            if i < len(jobs_to_rescore) - 1:
-                logging.debug(f"Waiting {config.LLM_REQUEST_DELAY_SECONDS} seconds before next job...")
-                time.sleep(config.LLM_REQUEST_DELAY_SECONDS)
             continue
         
         logging.debug(f"Custom resume text for job {job_id} (first 200 chars): {custom_resume_text[:200]}")
         score = get_resume_score_from_ai(custom_resume_text, job)
 
         if score is not None:
-            if supabase_utils.update_job_score(job_id, score, resume_score_stage="custom"):
-                successful_rescores += 1
-            else:
-                failed_rescores += 1 
+            pending_score_updates.append({"job_id": job_id, "resume_score": score})
         else:
-            failed_rescores += 1 
+            failed_rescores += 1
 
-        if i < len(jobs_to_rescore) - 1: 
-            logging.debug(f"Waiting {config.LLM_REQUEST_DELAY_SECONDS} seconds before next API call...")
-            time.sleep(config.LLM_REQUEST_DELAY_SECONDS)
+    # Flush all successful scores in a single bulk upsert instead of one
+    # UPDATE round-trip per job.
+    if pending_score_updates:
+        if supabase_utils.update_job_scores(pending_score_updates, resume_score_stage="custom"):
+            successful_rescores += len(pending_score_updates)
+        else:
+            failed_rescores += len(pending_score_updates)
 
     rescore_end_time = time.time()
     logging.info("--- Job Re-scoring Finished ---")
@@ -312,30 +425,46 @@ def main():
             logging.info(f"Processing {len(jobs_to_score_initially)} jobs for initial scoring...")
             successful_initial_scores = 0
             failed_initial_scores = 0
+            pending_score_updates = []
 
-            # 4. Loop Through Jobs and Score Them
-            for i, job in enumerate(jobs_to_score_initially):
-                job_id = job.get('job_id')
-                if not job_id:
+            valid_jobs = []
+            for job in jobs_to_score_initially:
+                if job.get('job_id'):
+                    valid_jobs.append(job)
+                else:
                     logging.warning("Found job data without job_id during initial scoring. Skipping.")
-                    failed_initial_scores +=1
-                    continue
+                    failed_initial_scores += 1
 
-                logging.info(f"--- Initial Scoring Job {i+1}/{len(jobs_to_score_initially)} (ID: {job_id}) ---")
-                score = get_resume_score_from_ai(default_resume_text, job)
+            # 4. Score Jobs in Batches (one LLM call per batch)
+            batch_size = max(1, config.SCORING_BATCH_SIZE)
+            for batch_start in range(0, len(valid_jobs), batch_size):
+                batch = valid_jobs[batch_start:batch_start + batch_size]
+                logging.info(f"--- Initial Scoring Batch: jobs {batch_start + 1}-{batch_start + len(batch)}/{len(valid_jobs)} ---")
+
+                if len(batch) > 1:
+                    batch_scores = get_resume_scores_from_ai_batch(default_resume_text, batch)
+                else:
+                    batch_scores = {}
 
-                if score is not None:
-                    if supabase_utils.update_job_score(job_id, score, resume_score_stage="initial"):
-                        successful_initial_scores += 1
+                for job in batch:
+                    job_id = str(job.get('job_id'))
+                    score = batch_scores.get(job_id)
+                    if score is None:
+                        # Batch miss (or batching disabled): score individually.
+                        score = get_resume_score_from_ai(default_resume_text, job)
+
+                    if score is not None:
+                        pending_score_updates.append({"job_id": job_id, "resume_score": score})
                     else:
                         failed_initial_scores += 1
+
+            # Flush all successful scores in a single bulk upsert.
+            if pending_score_updates:
+                if supabase_utils.update_job_scores(pending_score_updates, resume_score_stage="initial"):
+                    successful_initial_scores += len(pending_score_updates)
                 else:
-                    failed_initial_scores += 1
+                    failed_initial_scores += len(pending_score_updates)
 
-                if i < len(jobs_to_score_initially) - 1:
-                    logging.debug(f"Waiting {config.LLM_REQUEST_DELAY_SECONDS} seconds before next API call...")
-                    time.sleep(config.LLM_REQUEST_DELAY_SECONDS)
-            
             initial_score_end_time = time.time()
             logging.info("--- Initial Scoring Phase Finished ---")
             logging.info(f"Successfully initially scored: {successful_initial_scores}")
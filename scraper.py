@@ -1,18 +1,55 @@
+import hashlib
 import requests
 from bs4 import BeautifulSoup
 from datetime import datetime, timedelta
 import time 
 import random 
 import logging
+import re
 import config
 import user_agents
 import supabase_utils
-from markdownify import markdownify as md
+from markdownify import MarkdownConverter
 import json
 
 # --- Setup Logging ---
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# Shared HTTP session so TLS connections are kept alive and reused across
+# all scraping calls instead of handshaking per request. Per-request
+# User-Agent rotation still works via the headers= argument.
+_http_session = requests.Session()
+
+# Shared converter instance so the options are only parsed once.
+_markdown_converter = MarkdownConverter(
+    heading_style="ATX",
+    bullets="-",
+    strip=['img'],
+)
+
+# Matches anything that looks like an HTML tag; if a description has none,
+# it is already plain text/Markdown and needs no conversion.
+_HTML_TAG_RE = re.compile(r"<[a-zA-Z/!][^>]*>")
+
+# LinkedIn postings are frequently reposted with byte-identical
+# descriptions, so cache conversion results keyed by content hash.
+_markdown_cache: dict = {}
+
+def _collapse_blank_lines(text: str) -> str:
+    """Collapses runs of blank lines down to a single blank line."""
+    lines = text.splitlines()
+    cleaned_lines = []
+    prev_blank = False
+    for line in lines:
+        if not line.strip():
+            if not prev_blank:
+                cleaned_lines.append('')
+            prev_blank = True
+        else:
+            cleaned_lines.append(line)
+            prev_blank = False
+    return '\n'.join(cleaned_lines).strip()
+
 # Convert HTML description to Markdown
 def convert_html_to_markdown(html: str) -> str | None:
     """
@@ -24,42 +61,61 @@ def convert_html_to_markdown(html: str) -> str | None:
         logging.info("Received empty HTML for Markdown conversion, returning empty string.")
         return ""
 
+    # Fast path: no HTML tags means the text is already plain text or
+    # Markdown, so skip the parse-and-convert step entirely.
+    if not _HTML_TAG_RE.search(html):
+        logging.debug("Description contains no HTML tags; skipping Markdown conversion.")
+        return _collapse_blank_lines(html)
+
+    cache_key = hashlib.sha256(html.encode('utf-8')).hexdigest()
+    if cache_key in _markdown_cache:
+        logging.debug("Markdown conversion cache hit; reusing previous result.")
+        return _markdown_cache[cache_key]
+
     try:
         # Clean the HTML: remove scripts, styles, nav, and other non-content tags
         soup = BeautifulSoup(html, 'html.parser')
         for tag in soup.find_all(['script', 'style', 'nav', 'footer', 'header', 'iframe', 'noscript']):
             tag.decompose()
 
-        cleaned_html = str(soup)
-
-        # Convert cleaned HTML to Markdown
-        markdown_text = md(
-            cleaned_html,
-            heading_style="ATX",
-            bullets="-",
-            strip=['img'],
-        )
+        # Convert the already-parsed soup directly to Markdown, avoiding a
+        # serialize-and-reparse round trip through markdownify.
+        markdown_text = _markdown_converter.convert_soup(soup)
 
         # Clean up excessive blank lines
-        lines = markdown_text.splitlines()
-        cleaned_lines = []
-        prev_blank = False
-        for line in lines:
-            if not line.strip():
-                if not prev_blank:
-                    cleaned_lines.append('')
-                prev_blank = True
-            else:
-                cleaned_lines.append(line)
-                prev_blank = False
-        markdown_text = '\n'.join(cleaned_lines).strip()
+        markdown_text = _collapse_blank_lines(markdown_text)
 
         logging.info("Successfully converted HTML to Markdown.")
-        return markdown_text if markdown_text else ""
+        result = markdown_text if markdown_text else ""
+        _markdown_cache[cache_key] = result
+        return result
     except Exception as e:
         logging.error(f"Error during HTML to Markdown conversion: {e}")
         return None
 
+def _get_retry_after_seconds(response) -> float | None:
+    """Returns the server-suggested Retry-After delay in seconds, if present."""
+    if response is None:
+        return None
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None  # HTTP-date form; fall back to the configured delay
+
+def _dedupe_queries(queries) -> list:
+    """Removes duplicate search queries case-insensitively, preserving order."""
+    seen = set()
+    deduped = []
+    for query in queries:
+        key = query.strip().lower()
+        if key and key not in seen:
+            seen.add(key)
+            deduped.append(query)
+    return deduped
+
 def _get_careers_future_job_company_name(job_item: dict) -> str | None:
     """Helper to extract company name, preferring hiringCompany."""
     if not isinstance(job_item, dict):
@@ -89,7 +145,7 @@ def _fetch_linkedin_job_ids(search_query: str, location: str) -> list:
         target_url = f"https://www.linkedin.com/jobs-guest/jobs/api/seeMoreJobPostings/search?keywords={search_query.replace(' ', '%20')}&location={location}&geoId={config.LINKEDIN_GEO_ID}&f_TPR={config.LINKEDIN_JOB_POSTING_DATE}&f_JT={config.LINKEDIN_JOB_TYPE}&f_WT={config.LINKEDIN_F_WT}&start={start}"
 
         if start > 0:
-            sleep_time = random.uniform(5.0, 15.0)
+            sleep_time = random.uniform(*config.LINKEDIN_PAGE_DELAY_RANGE)
             logging.info(f"Waiting for {sleep_time:.2f} seconds before next request...")
             time.sleep(sleep_time)
 
@@ -105,14 +161,18 @@ def _fetch_linkedin_job_ids(search_query: str, location: str) -> list:
         retries = 0
         while retries <= config.MAX_RETRIES:
             try:
-                res = requests.get(target_url, headers=headers, timeout=config.REQUEST_TIMEOUT)
+                res = _http_session.get(target_url, headers=headers, timeout=config.REQUEST_TIMEOUT)
                 res.raise_for_status()
                 break
             except requests.exceptions.HTTPError as e:
                 if e.response.status_code == 429 and retries < config.MAX_RETRIES:
                     retries += 1
-                    wait_time = config.RETRY_DELAY_SECONDS + random.uniform(0, 5) 
-                    
+                    retry_after = _get_retry_after_seconds(e.response)
+                    if retry_after is not None:
+                        wait_time = retry_after + random.uniform(0, 2)
+                    else:
+                        wait_time = config.RETRY_DELAY_SECONDS + random.uniform(0, 5)
+
                     logging.warning(f"Error 429: Too Many Requests. Retrying attempt {retries}/{config.MAX_RETRIES} after {wait_time:.2f} seconds...")
                     time.sleep(wait_time)
 
@@ -189,7 +249,7 @@ def _fetch_linkedin_job_details(job_id: str) -> dict | None:
 
     logging.info(f"Preparing to fetch details for job ID: {job_id}")
 
-    sleep_time = random.uniform(3.0, 10.0)
+    sleep_time = random.uniform(*config.LINKEDIN_DETAIL_DELAY_RANGE)
 
     logging.info(f"Waiting for {sleep_time:.2f} seconds before fetching details...")
     time.sleep(sleep_time)
@@ -206,14 +266,18 @@ def _fetch_linkedin_job_details(job_id: str) -> dict | None:
     retries = 0
     while retries <= config.MAX_RETRIES:
         try:
-            resp = requests.get(job_detail_url, headers=headers, timeout=config.REQUEST_TIMEOUT)
+            resp = _http_session.get(job_detail_url, headers=headers, timeout=config.REQUEST_TIMEOUT)
             resp.raise_for_status()
             break
         except requests.exceptions.HTTPError as e:
             if e.response.status_code == 429 and retries < config.MAX_RETRIES:
                 retries += 1
-                wait_time = config.RETRY_DELAY_SECONDS + random.uniform(0, 5) 
-                
+                retry_after = _get_retry_after_seconds(e.response)
+                if retry_after is not None:
+                    wait_time = retry_after + random.uniform(0, 2)
+                else:
+                    wait_time = config.RETRY_DELAY_SECONDS + random.uniform(0, 5)
+
                 logging.warning(f"Error 429 for job ID {job_id}. Retrying attempt {retries}/{config.MAX_RETRIES} after {wait_time:.2f} seconds...")
                 time.sleep(wait_time)
                 user_agent = random.choice(user_agents.USER_AGENTS)
@@ -356,7 +420,9 @@ def process_linkedin_query(search_query: str, location: str, limit: int = None)
 
 
     logging.info("\n--- Starting Filtering Step: Checking against Supabase ---")
-    job_ids_set, company_title_set = supabase_utils.get_existing_jobs_from_supabase()
+    # Only check the scraped candidate IDs server-side rather than pulling
+    # the entire jobs table down to filter locally.
+    job_ids_set = supabase_utils.get_existing_job_ids(unique_linkedin_job_ids)
 
     new_job_ids_to_process = [
         str(job_id) for job_id in unique_linkedin_job_ids 
@@ -435,7 +501,7 @@ def _fetch_careers_future_jobs(search_query: str) -> list:
 
     try:
         logging.info(f"Fetching skill suggestions for query: '{search_query}' from {careers_future_suggestions_api_url}")
-        skills_suggestions_response = requests.post(
+        skills_suggestions_response = _http_session.post(
             careers_future_suggestions_api_url, 
             data=skills_suggestions_payload,
             timeout=config.REQUEST_TIMEOUT
@@ -486,7 +552,7 @@ def _fetch_careers_future_jobs(search_query: str) -> list:
             total_api_calls_for_search += 1
             logging.info(f"Job search API call {total_api_calls_for_search}: POST to {current_search_url}")
         
-            search_response = requests.post(current_search_url, json=search_payload)
+            search_response = _http_session.post(current_search_url, json=search_payload)
             search_response.raise_for_status()
             search_results_data  = search_response.json()
 
@@ -549,7 +615,7 @@ def _fetch_careers_future_job_details(job_id: str) -> dict | None:
     logging.info(f"Attempting to fetch job details for ID: {job_id} from URL: {api_url}")
 
     try:
-        response = requests.get(api_url, timeout=config.REQUEST_TIMEOUT) 
+        response = _http_session.get(api_url, timeout=config.REQUEST_TIMEOUT) 
 
         response.raise_for_status()
 
@@ -705,7 +771,7 @@ if __name__ == "__main__":
     if "linkedin" in config.SCRAPING_SOURCES:
         logging.info("\n--- Starting LinkedIn Job Scraping ---")
         max_jobs_per_search = config.MAX_JOBS_PER_SEARCH.get("linkedin", getattr(config, 'DEFAULT_MAX_JOBS_PER_SEARCH', 10))
-        for query in config.LINKEDIN_SEARCH_QUERIES:
+        for query in _dedupe_queries(config.LINKEDIN_SEARCH_QUERIES):
             print(f"\n{'='*20} Processing Search Query: '{query}' {'='*20}")
 
             # 1. Process the query: Scrape IDs, filter, fetch new details
@@ -725,7 +791,7 @@ if __name__ == "__main__":
     if "careers_future" in config.SCRAPING_SOURCES:
         logging.info(f"\n--- Starting Careers Future Job Scraping ---")
         max_jobs_per_search = config.MAX_JOBS_PER_SEARCH.get("careers_future", getattr(config, 'DEFAULT_MAX_JOBS_PER_SEARCH', 10))
-        for query in config.CAREERS_FUTURE_SEARCH_QUERIES:
+        for query in _dedupe_queries(config.CAREERS_FUTURE_SEARCH_QUERIES):
             logging.info(f"\n{'='*20} Processing Careers Future Search Query: '{query}' {'='*20}")
 
             # 1. Process the query: Scrape IDs, filter, fetch new details
@@ -81,7 +81,8 @@ CREATE TABLE IF NOT EXISTS "public"."jobs" (
     "is_interested" boolean,
     "customized_resume_id" "uuid",
     "provider" "text",
-    "posted_at" timestamp with time zone
+    "posted_at" timestamp with time zone,
+    "claimed_at" timestamp with time zone
 );
 
 
@@ -341,7 +342,13 @@ $$;
 ALTER FUNCTION "public"."get_jobs_for_rescore"("p_limit_val" integer) OWNER TO "postgres";
 
 
-CREATE OR REPLACE FUNCTION "public"."get_jobs_for_resume_generation_custom_sort"("p_page_number" integer, "p_page_size" integer) RETURNS TABLE("job_id" "text", "company" "text", "job_title" "text", "level" "text", "location" "text", "description" "text", "status" "text", "is_active" boolean, "application_date" timestamp with time zone, "resume_score" smallint, "notes" "text", "scraped_at" timestamp with time zone, "last_checked" timestamp with time zone, "job_state" "text", "resume_score_stage" "text", "is_interested" boolean, "customized_resume_id" "uuid", "provider" "text")
+-- Only the columns the resume generator actually consumes: descriptions are
+-- by far the heaviest field, so dropping the unused metadata columns keeps
+-- the payload to roughly what the prompts need. DROP first because CREATE OR
+-- REPLACE cannot change a function's return type.
+DROP FUNCTION IF EXISTS "public"."get_jobs_for_resume_generation_custom_sort"("p_page_number" integer, "p_page_size" integer);
+
+CREATE OR REPLACE FUNCTION "public"."get_jobs_for_resume_generation_custom_sort"("p_page_number" integer, "p_page_size" integer) RETURNS TABLE("job_id" "text", "company" "text", "job_title" "text", "level" "text", "location" "text", "description" "text", "resume_score" smallint, "is_interested" boolean)
     LANGUAGE "plpgsql"
     AS $$
 BEGIN
@@ -353,18 +360,8 @@ BEGIN
         j.level,
         j.location,
         j.description,
-        j.status,
-        j.is_active,
-        j.application_date,
         j.resume_score,
-        j.notes,
-        j.scraped_at,
-        j.last_checked,
-        j.job_state,
-        j.resume_score_stage,
-        j.is_interested,
-        j.customized_resume_id, -- Still selected, will be NULL
-        j.provider
+        j.is_interested
     FROM
         jobs j
     WHERE
@@ -389,6 +386,51 @@ $$;
 ALTER FUNCTION "public"."get_jobs_for_resume_generation_custom_sort"("p_page_number" integer, "p_page_size" integer) OWNER TO "postgres";
 
 
+-- Atomically claims the next p_limit jobs for resume generation by flipping
+-- job_state to 'processing'. FOR UPDATE SKIP LOCKED makes concurrent callers
+-- receive disjoint sets, so parallel runners never double-process (and never
+-- double-spend LLM calls on) the same job. Claims older than 30 minutes are
+-- treated as abandoned (crashed run) and handed out again;
+-- save_and_link_resume releases the claim on success.
+CREATE OR REPLACE FUNCTION "public"."claim_jobs_for_resume_generation"("p_limit" integer) RETURNS TABLE("job_id" "text", "company" "text", "job_title" "text", "level" "text", "location" "text", "description" "text", "resume_score" smallint, "is_interested" boolean)
+    LANGUAGE "plpgsql"
+    AS $$
+BEGIN
+    RETURN QUERY
+    UPDATE jobs j
+    SET job_state = 'processing',
+        claimed_at = now()
+    FROM (
+        SELECT c.job_id
+        FROM jobs c
+        WHERE
+            c.is_active = TRUE
+            AND c.status = 'new'
+            AND c.resume_score >= 50
+            AND c.customized_resume_id IS NULL
+            AND (
+                c.job_state = 'new'
+                OR (c.job_state = 'processing' AND c.claimed_at < now() - interval '30 minutes')
+            )
+        ORDER BY
+            CASE
+                WHEN c.is_interested IS TRUE THEN 1
+                WHEN c.is_interested IS NULL THEN 2
+                ELSE 3
+            END ASC,
+            c.resume_score DESC
+        LIMIT p_limit
+        FOR UPDATE SKIP LOCKED
+    ) picked
+    WHERE j.job_id = picked.job_id
+    RETURNING j.job_id, j.company, j.job_title, j.level, j.location, j.description, j.resume_score, j.is_interested;
+END;
+$$;
+
+
+ALTER FUNCTION "public"."claim_jobs_for_resume_generation"("p_limit" integer) OWNER TO "postgres";
+
+
 CREATE OR REPLACE FUNCTION "public"."get_top_scored_jobs_custom_sort"("p_page_number" integer, "p_page_size" integer, "p_provider" "text" DEFAULT NULL::"text", "p_min_score" integer DEFAULT 50, "p_max_score" integer DEFAULT 100, "p_is_interested_option" "text" DEFAULT NULL::"text") RETURNS TABLE("job_id" "text", "company" "text", "job_title" "text", "level" "text", "location" "text", "description" "text", "status" "text", "is_active" boolean, "application_date" timestamp with time zone, "resume_score" smallint, "notes" "text", "scraped_at" timestamp with time zone, "last_checked" timestamp with time zone, "job_state" "text", "resume_score_stage" "text", "is_interested" boolean, "customized_resume_id" "uuid", "resume_link" "text", "provider" "text")
     LANGUAGE "plpgsql"
     AS $$
@@ -524,6 +566,49 @@ $$;
 ALTER FUNCTION "public"."get_top_scored_jobs_custom_sort"("p_page_number" integer, "p_page_size" integer, "p_provider" "text", "p_min_score" integer, "p_max_score" integer, "p_is_interested_option" "text", "p_search_query" "text") OWNER TO "postgres";
 
 
+CREATE OR REPLACE FUNCTION "public"."save_and_link_resume"("p_resume" "jsonb", "p_resume_link" "text", "p_job_id" "text") RETURNS "uuid"
+    LANGUAGE "plpgsql"
+    AS $$
+DECLARE
+    v_resume_id uuid;
+BEGIN
+    INSERT INTO customized_resumes (
+        name, email, phone, location, summary, skills, education,
+        experience, projects, certifications, languages, links, resume_link
+    )
+    VALUES (
+        p_resume->>'name',
+        p_resume->>'email',
+        p_resume->>'phone',
+        p_resume->>'location',
+        p_resume->>'summary',
+        ARRAY(SELECT jsonb_array_elements_text(COALESCE(p_resume->'skills', '[]'::jsonb))),
+        p_resume->'education',
+        p_resume->'experience',
+        p_resume->'projects',
+        p_resume->'certifications',
+        ARRAY(SELECT jsonb_array_elements_text(COALESCE(p_resume->'languages', '[]'::jsonb))),
+        p_resume->'links',
+        p_resume_link
+    )
+    RETURNING id INTO v_resume_id;
+
+    UPDATE jobs
+    SET customized_resume_id = v_resume_id,
+        -- Release any processing claim so the job re-enters the
+        -- downstream (apply/re-score) queries.
+        job_state = 'new',
+        claimed_at = NULL
+    WHERE job_id = p_job_id;
+
+    RETURN v_resume_id;
+END;
+$$;
+
+
+ALTER FUNCTION "public"."save_and_link_resume"("p_resume" "jsonb", "p_resume_link" "text", "p_job_id" "text") OWNER TO "postgres";
+
+
 CREATE OR REPLACE FUNCTION "public"."update_last_updated_column"() RETURNS "trigger"
     LANGUAGE "plpgsql"
     AS $$
@@ -691,6 +776,12 @@ GRANT ALL ON FUNCTION "public"."get_jobs_for_resume_generation_custom_sort"("p_p
 
 
 
+GRANT ALL ON FUNCTION "public"."claim_jobs_for_resume_generation"("p_limit" integer) TO "anon";
+GRANT ALL ON FUNCTION "public"."claim_jobs_for_resume_generation"("p_limit" integer) TO "authenticated";
+GRANT ALL ON FUNCTION "public"."claim_jobs_for_resume_generation"("p_limit" integer) TO "service_role";
+
+
+
 GRANT ALL ON FUNCTION "public"."get_top_scored_jobs_custom_sort"("p_page_number" integer, "p_page_size" integer, "p_provider" "text", "p_min_score" integer, "p_max_score" integer, "p_is_interested_option" "text") TO "anon";
 GRANT ALL ON FUNCTION "public"."get_top_scored_jobs_custom_sort"("p_page_number" integer, "p_page_size" integer, "p_provider" "text", "p_min_score" integer, "p_max_score" integer, "p_is_interested_option" "text") TO "authenticated";
 GRANT ALL ON FUNCTION "public"."get_top_scored_jobs_custom_sort"("p_page_number" integer, "p_page_size" integer, "p_provider" "text", "p_min_score" integer, "p_max_score" integer, "p_is_interested_option" "text") TO "service_role";
@@ -703,6 +794,12 @@ GRANT ALL ON FUNCTION "public"."get_top_scored_jobs_custom_sort"("p_page_number"
 
 
 
+GRANT ALL ON FUNCTION "public"."save_and_link_resume"("p_resume" "jsonb", "p_resume_link" "text", "p_job_id" "text") TO "anon";
+GRANT ALL ON FUNCTION "public"."save_and_link_resume"("p_resume" "jsonb", "p_resume_link" "text", "p_job_id" "text") TO "authenticated";
+GRANT ALL ON FUNCTION "public"."save_and_link_resume"("p_resume" "jsonb", "p_resume_link" "text", "p_job_id" "text") TO "service_role";
+
+
+
 GRANT ALL ON FUNCTION "public"."update_last_updated_column"() TO "anon";
 GRANT ALL ON FUNCTION "public"."update_last_updated_column"() TO "authenticated";
 GRANT ALL ON FUNCTION "public"."update_last_updated_column"() TO "service_role";
@@ -10,6 +10,10 @@ import logging # Import logging
 if not config.SUPABASE_URL or not config.SUPABASE_SERVICE_ROLE_KEY:
     raise ValueError("Supabase URL and Key must be set in environment variables or config.")
 
+# All database access goes through PostgREST over HTTP (this module-level
+# client reuses one keep-alive connection pool), so we never hold Postgres
+# sessions and don't need the Supavisor transaction-mode pooler that direct
+# asyncpg/psycopg connections would require.
 supabase: Client = create_client(config.SUPABASE_URL, config.SUPABASE_SERVICE_ROLE_KEY)
 
 # --- Supabase Functions ---
@@ -60,6 +64,40 @@ def get_existing_jobs_from_supabase(batch_size: int = 1000) -> tuple[set, set]:
 
     return existing_ids, existing_company_title_keys
 
+def get_existing_job_ids(candidate_ids: list, chunk_size: int = 200) -> set:
+    """
+    Checks which of the given candidate job IDs already exist in the 'jobs'
+    table. Unlike get_existing_jobs_from_supabase, the filter runs
+    server-side (via .in_ on the candidates), so bandwidth scales with the
+    scraped batch instead of the whole table.
+    Returns a set of the candidate IDs that are already present.
+    """
+    existing_ids = set()
+    if not candidate_ids:
+        return existing_ids
+
+    candidates = [str(candidate_id) for candidate_id in candidate_ids]
+
+    try:
+        for i in range(0, len(candidates), chunk_size):
+            chunk = candidates[i:i + chunk_size]
+            response = (
+                supabase.table(config.SUPABASE_TABLE_NAME)
+                .select("job_id")
+                .in_("job_id", chunk)
+                .execute()
+            )
+            for item in (response.data or []):
+                if item.get("job_id"):
+                    existing_ids.add(str(item["job_id"]))
+
+        print(f"Checked {len(candidates)} candidate IDs against Supabase; {len(existing_ids)} already exist.")
+
+    except Exception as e:
+        print(f"Error checking existing job IDs in Supabase: {e}")
+
+    return existing_ids
+
 def save_jobs_to_supabase(jobs_data: list):
     """
     Saves or updates a list of job data dictionaries to the Supabase table using upsert.
@@ -131,7 +169,7 @@ def get_jobs_to_score(limit: int) -> list:
         return []
 
     try:
-        logging.info(f"Fetching up to {limit} jobs needing scoring...")
+        logging.info("Fetching up to %s jobs needing scoring...", limit)
         # Select fields needed for scoring
         response = supabase.table(config.SUPABASE_TABLE_NAME)\
                            .select("job_id, job_title, company, description, level")\
@@ -142,14 +180,14 @@ def get_jobs_to_score(limit: int) -> list:
                            .execute()
 
         if response.data:
-            logging.info(f"Successfully fetched {len(response.data)} jobs to score.")
+            logging.info("Successfully fetched %s jobs to score.", len(response.data))
             return response.data
         else:
             logging.info("No jobs found needing scoring at this time.")
             return []
 
     except Exception as e:
-        logging.error(f"Error fetching jobs to score from Supabase: {e}")
+        logging.error("Error fetching jobs to score from Supabase: %s", e)
         return []
 
 def get_top_scored_jobs_to_apply(limit: int) -> list:
@@ -164,7 +202,7 @@ def get_top_scored_jobs_to_apply(limit: int) -> list:
         return []
 
     try:
-        logging.info(f"Fetching up to {limit} top-scored jobs to apply for...")
+        logging.info("Fetching up to %s top-scored jobs to apply for...", limit)
         response = supabase.table(config.SUPABASE_TABLE_NAME)\
                            .select("job_id, job_title, company, resume_score")\
                            .eq("is_active", True)\
@@ -175,20 +213,21 @@ def get_top_scored_jobs_to_apply(limit: int) -> list:
                            .execute()
 
         if response.data:
-            logging.info(f"Successfully fetched {len(response.data)} top-scored jobs to apply for.")
+            logging.info("Successfully fetched %s top-scored jobs to apply for.", len(response.data))
             return response.data
         else:
             logging.info("No top-scored jobs found ready for application at this time.")
             return []
 
     except Exception as e:
-        logging.error(f"Error fetching top-scored jobs to apply for from Supabase: {e}")
+        logging.error("Error fetching top-scored jobs to apply for from Supabase: %s", e)
         return []
 
-def get_top_scored_jobs_for_resume_generation(limit: int) -> list:
+def get_top_scored_jobs_for_resume_generation(limit: int, page: int = 1) -> list:
     """
     Fetches the top-scored jobs from Supabase using the RPC 'get_top_scored_jobs_custom_sort'.
-    p_page_number is set to 1 and p_page_size is set to the limit.
+    p_page_size is set to the limit; page selects which page of results
+    (page 2 is the batch after the current top one, used for prefetching).
     Selects fields needed for the application process.
     """
     if limit <= 0:
@@ -196,27 +235,54 @@ def get_top_scored_jobs_for_resume_generation(limit: int) -> list:
         return []
 
     try:
-        logging.info(f"Fetching up to {limit} top-scored jobs to apply for using RPC 'get_top_scored_jobs_custom_sort'...")
+        logging.info("Fetching up to %s top-scored jobs to apply for using RPC 'get_top_scored_jobs_custom_sort'...", limit)
         response = supabase.rpc(
                 "get_jobs_for_resume_generation_custom_sort",
-                {"p_page_number": 1, "p_page_size": limit}
+                {"p_page_number": page, "p_page_size": limit}
             ).execute()
 
         if response.data:
-            logging.info(f"Successfully fetched {len(response.data)} top-scored jobs to apply for via RPC.")
+            logging.info("Successfully fetched %s top-scored jobs to apply for via RPC.", len(response.data))
             return response.data
         else:
             # Check for RPC specific errors if any, or just log general empty data
             if hasattr(response, 'error') and response.error:
-                logging.error(f"Error calling RPC 'get_top_scored_jobs_custom_sort': {response.error.message}")
+                logging.error("Error calling RPC 'get_top_scored_jobs_custom_sort': %s", response.error.message)
             else:
                 logging.info("No top-scored jobs found ready for application at this time via RPC.")
             return []
 
     except Exception as e:
-        logging.error(f"Error fetching top-scored jobs to apply for from Supabase RPC: {e}")
+        logging.error("Error fetching top-scored jobs to apply for from Supabase RPC: %s", e)
         return []
 
+def claim_jobs_for_resume_generation(limit: int, page: int = 1) -> list:
+    """
+    Atomically claims up to `limit` top-scored jobs for resume generation via
+    the RPC 'claim_jobs_for_resume_generation' (FOR UPDATE SKIP LOCKED), so
+    concurrent runners always receive disjoint batches. Falls back to the
+    read-only fetch (honoring `page`) if the RPC is not deployed yet.
+    """
+    if limit <= 0:
+        logging.warning("Limit for jobs to claim must be positive.")
+        return []
+
+    try:
+        logging.info("Claiming up to %s top-scored jobs for resume generation...", limit)
+        response = supabase.rpc(
+            "claim_jobs_for_resume_generation", {"p_limit": limit}
+        ).execute()
+        if response.data:
+            logging.info("Claimed %s jobs for resume generation.", len(response.data))
+            return response.data
+        logging.info("No unclaimed jobs available for resume generation.")
+        return []
+    except Exception as e:
+        logging.warning(
+            "RPC 'claim_jobs_for_resume_generation' failed (%s); falling back to read-only fetch.", e
+        )
+        return get_top_scored_jobs_for_resume_generation(limit, page=page)
+
 def get_jobs_to_rescore(limit: int) -> list:
     """
     Fetches jobs from Supabase that are ready for re-scoring with a custom resume.
@@ -229,7 +295,7 @@ def get_jobs_to_rescore(limit: int) -> list:
         return []
 
     try:
-        logging.info(f"Fetching up to {limit} jobs for re-scoring via RPC...")
+        logging.info("Fetching up to %s jobs for re-scoring via RPC...", limit)
         # Note: We updated the RPC to also return customized_resume_id
         response = supabase.rpc(
             "get_jobs_for_rescore", 
@@ -238,21 +304,21 @@ def get_jobs_to_rescore(limit: int) -> list:
 
         if hasattr(response, 'data') and response.data is not None:
             if response.data: # Check if list is not empty
-                logging.info(f"Successfully fetched {len(response.data)} jobs for re-scoring via RPC.")
+                logging.info("Successfully fetched %s jobs for re-scoring via RPC.", len(response.data))
                 return response.data
             else:
                 logging.info("No jobs found meeting re-scoring criteria via RPC at this time (empty list returned).")
                 return []
         elif hasattr(response, 'error') and response.error: # Handle explicit error attribute
-             logging.error(f"Error calling RPC get_jobs_for_rescore: {response.error}")
+             logging.error("Error calling RPC get_jobs_for_rescore: %s", response.error)
              return []
         else: # Fallback for unexpected response structure
-            logging.warning(f"Unexpected response structure from RPC call: {response}")
+            logging.warning("Unexpected response structure from RPC call: %s", response)
             return []
 
 
     except Exception as e:
-        logging.error(f"Exception calling RPC get_jobs_for_rescore: {e}", exc_info=True)
+        logging.error("Exception calling RPC get_jobs_for_rescore: %s", e, exc_info=True)
         return []
 
 def update_job_score(job_id: str, score: int, resume_score_stage: str = "initial") -> bool:
@@ -261,15 +327,15 @@ def update_job_score(job_id: str, score: int, resume_score_stage: str = "initial
     Returns True on success, False on failure.
     """
     if not job_id or score is None:
-        logging.error(f"Invalid input for updating job score: job_id={job_id}, score={score}")
+        logging.error("Invalid input for updating job score: job_id=%s, score=%s", job_id, score)
         return False
 
     if resume_score_stage not in ["initial", "custom"]:
-        logging.error(f"Invalid resume_score_stage: {resume_score_stage}. Must be 'initial' or 'custom'.")
+        logging.error("Invalid resume_score_stage: %s. Must be 'initial' or 'custom'.", resume_score_stage)
         return False
 
     try:
-        logging.info(f"Updating score for job_id {job_id} to {score} and stage to {resume_score_stage}...")
+        logging.info("Updating score for job_id %s to %s and stage to %s...", job_id, score, resume_score_stage)
         update_payload = {
             "resume_score": score,
             "resume_score_stage": resume_score_stage
@@ -282,22 +348,69 @@ def update_job_score(job_id: str, score: int, resume_score_stage: str = "initial
         # Check if the update was successful (response structure might vary)
         # A common pattern is checking if data is returned or count is non-zero
         if hasattr(response, 'data') and response.data:
-             logging.info(f"Successfully updated score for job_id {job_id}.")
+             logging.info("Successfully updated score for job_id %s.", job_id)
              return True
         elif hasattr(response, 'count') and response.count is not None and response.count > 0:
-             logging.info(f"Successfully updated score for job_id {job_id} (count={response.count}).")
+             logging.info("Successfully updated score for job_id %s (count=%s).", job_id, response.count)
              return True
         elif not hasattr(response, 'data') and not hasattr(response, 'count'):
              # Handle cases where the response might not have data/count but didn't error
-             logging.warning(f"Update score for job_id {job_id} executed, but response structure unclear: {response}")
+             logging.warning("Update score for job_id %s executed, but response structure unclear: %s", job_id, response)
              return True # Assume success if no exception occurred
         else:
-             logging.warning(f"Update score for job_id {job_id} might have failed or job not found. Response: {response}")
+             logging.warning("Update score for job_id %s might have failed or job not found. Response: %s", job_id, response)
              return False
 
 
     except Exception as e:
-        logging.error(f"Error updating score for job_id {job_id} in Supabase: {e}")
+        logging.error("Error updating score for job_id %s in Supabase: %s", job_id, e)
+        return False
+
+def update_job_scores(score_rows: list, resume_score_stage: str = "initial") -> bool:
+    """
+    Updates 'resume_score' and 'resume_score_stage' for many jobs in a single
+    bulk upsert, instead of one UPDATE round-trip per job.
+
+    Args:
+        score_rows: A list of dicts, each with 'job_id' and 'resume_score'.
+        resume_score_stage: Stage applied to every row ('initial' or 'custom').
+
+    Returns True on success, False on failure.
+    """
+    if not score_rows:
+        logging.info("No job scores provided for bulk update.")
+        return True
+
+    if resume_score_stage not in ["initial", "custom"]:
+        logging.error("Invalid resume_score_stage: %s. Must be 'initial' or 'custom'.", resume_score_stage)
+        return False
+
+    payload = []
+    for row in score_rows:
+        job_id = row.get("job_id")
+        score = row.get("resume_score")
+        if not job_id or score is None:
+            logging.warning("Skipping invalid score row in bulk update: %s", row)
+            continue
+        payload.append({
+            "job_id": str(job_id),
+            "resume_score": score,
+            "resume_score_stage": resume_score_stage,
+        })
+
+    if not payload:
+        logging.warning("No valid score rows remaining for bulk update.")
+        return False
+
+    try:
+        logging.info("Bulk updating scores for %s jobs in a single upsert...", len(payload))
+        supabase.table(config.SUPABASE_TABLE_NAME)\
+                .upsert(payload, on_conflict="job_id")\
+                .execute()
+        logging.info("Successfully bulk updated scores for %s jobs.", len(payload))
+        return True
+    except Exception as e:
+        logging.error("Error bulk updating job scores in Supabase: %s", e)
         return False
 
 def get_job_by_id(job_id: str) -> dict | None:
@@ -312,7 +425,7 @@ def get_job_by_id(job_id: str) -> dict | None:
         return None
 
     try:
-        logging.info(f"Fetching job details for job_id: {job_id} from table '{config.SUPABASE_TABLE_NAME}'")
+        logging.info("Fetching job details for job_id: %s from table '%s'", job_id, config.SUPABASE_TABLE_NAME)
         response = supabase.table(config.SUPABASE_TABLE_NAME)\
                            .select("company, job_title, level, description")\
                            .eq("job_id", job_id) \
@@ -320,14 +433,14 @@ def get_job_by_id(job_id: str) -> dict | None:
                            .execute() # Assuming 'job_id' is the column name
 
         if response.data:
-            logging.info(f"Successfully fetched job data for job_id: {job_id}.")
+            logging.info("Successfully fetched job data for job_id: %s.", job_id)
             return response.data[0] # Return the first matching job
         else:
-            logging.warning(f"No job found for job_id: {job_id}")
+            logging.warning("No job found for job_id: %s", job_id)
             return None
 
     except Exception as e:
-        logging.error(f"Error fetching job data from Supabase for job_id {job_id}: {e}")
+        logging.error("Error fetching job data from Supabase for job_id %s: %s", job_id, e)
         return None
 
 def upload_customized_resume_to_storage(file_content: bytes, destination_path: str) -> Optional[str]:
@@ -351,7 +464,7 @@ def upload_customized_resume_to_storage(file_content: bytes, destination_path: s
         return None
 
     try:
-        logging.info(f"Uploading resume to Supabase Storage at path: {destination_path}")
+        logging.info("Uploading resume to Supabase Storage at path: %s", destination_path)
 
         # Use upsert=True if you want to overwrite if a file with the same name exists,
         # otherwise False (or omit) to potentially get an error if it exists.
@@ -363,17 +476,17 @@ def upload_customized_resume_to_storage(file_content: bytes, destination_path: s
                 file_options={"content-type": "application/pdf", "upsert": "true"} # Set upsert based on desired behavior
             )
 
-        logging.info(f"Successfully uploaded resume to path: {destination_path}")
+        logging.info("Successfully uploaded resume to path: %s", destination_path)
         return destination_path
 
     except Exception as e:
         # Supabase client might raise specific exceptions, catch broadly for now
-        logging.error(f"Error uploading file to Supabase Storage: {e}")
+        logging.error("Error uploading file to Supabase Storage: %s", e)
         # Attempt to remove partially uploaded file if possible/needed (more complex error handling)
         # try:
         #     supabase.storage.from_(config.SUPABASE_STORAGE_BUCKET).remove([destination_path])
         # except:
-        #     logging.warning(f"Could not clean up potentially failed upload at {destination_path}")
+        #     logging.warning("Could not clean up potentially failed upload at %s", destination_path)
         return None
 
 def update_job_with_resume_link(job_id: str, customized_resume_id: str,  new_status: Optional[str] = "resume_generated") -> bool:
@@ -398,7 +511,7 @@ def update_job_with_resume_link(job_id: str, customized_resume_id: str,  new_sta
         # if new_status:
         #     update_data["job_state"] = new_status # Assuming 'status' is your column name
 
-        logging.info(f"Updating job {job_id} with resume link, resume id and status '{new_status or 'unchanged'}'...")
+        logging.info("Updating job %s with resume link, resume id and status '%s'...", job_id, new_status or 'unchanged')
 
         response = supabase.table(config.SUPABASE_TABLE_NAME)\
                            .update(update_data)\
@@ -407,18 +520,92 @@ def update_job_with_resume_link(job_id: str, customized_resume_id: str,  new_sta
 
         # Check if the update affected any rows (response.data might contain updated rows)
         if response.data:
-            logging.info(f"Successfully updated job {job_id}.")
+            logging.info("Successfully updated job %s.", job_id)
             return True
         else:
             # This might happen if the job_id didn't exist or matched 0 rows
-            logging.warning(f"Update query executed for job {job_id}, but no rows seemed to be affected.")
+            logging.warning("Update query executed for job %s, but no rows seemed to be affected.", job_id)
             # Depending on strictness, you might return False here
             return False # Treat as failure if no row was confirmed updated
 
     except Exception as e:
-        logging.error(f"Error updating job {job_id} in Supabase: {e}")
+        logging.error("Error updating job %s in Supabase: %s", job_id, e)
         return False
 
+def mark_job_as_applied(job_id: str) -> bool:
+    """
+    Marks a job as applied by setting its status and application date.
+
+    Args:
+        job_id: The unique ID of the job that was applied to.
+
+    Returns:
+        True if the update was successful, False otherwise.
+    """
+    if not job_id:
+        logging.error("Job ID is required to mark a job as applied.")
+        return False
+
+    try:
+        logging.info("Marking job %s as applied...", job_id)
+        response = supabase.table(config.SUPABASE_TABLE_NAME)\
+                           .update({
+                               "status": "applied",
+                               "application_date": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                           })\
+                           .eq("job_id", job_id)\
+                           .execute()
+
+        if response.data:
+            logging.info("Successfully marked job %s as applied.", job_id)
+            return True
+        else:
+            logging.warning("Mark-as-applied query executed for job %s, but no rows seemed to be affected.", job_id)
+            return False
+
+    except Exception as e:
+        logging.error("Error marking job %s as applied in Supabase: %s", job_id, e)
+        return False
+
+def save_and_link_customized_resume(resume_data: 'Resume', resume_path: str, job_id: str) -> Optional[Any]:
+    """
+    Saves a customized resume and links it to its job in a single RPC
+    ('save_and_link_resume', defined in supabase_setup/init.sql): one
+    round-trip and one transaction instead of an insert followed by an
+    update, with no window where the resume row exists unlinked.
+    Falls back to the two-step helpers if the RPC is unavailable.
+
+    Args:
+        resume_data: A Resume object (Pydantic model) containing the resume details.
+        resume_path: The path of the uploaded resume in storage.
+        job_id: The unique ID of the job to link the resume to.
+
+    Returns:
+        The ID of the inserted resume if successful, None otherwise.
+    """
+    if not resume_data or not resume_path or not job_id:
+        logging.error("Resume data, resume path, and job ID are required for save-and-link.")
+        return None
+
+    try:
+        payload = resume_data.model_dump(exclude_none=True)
+        response = supabase.rpc(
+            "save_and_link_resume",
+            {"p_resume": payload, "p_resume_link": resume_path, "p_job_id": job_id},
+        ).execute()
+
+        if response.data:
+            logging.info("Saved and linked customized resume %s for job %s via RPC.", response.data, job_id)
+            return response.data
+        logging.warning("RPC 'save_and_link_resume' returned no data for job %s; falling back to two-step save.", job_id)
+    except Exception as e:
+        logging.warning("RPC 'save_and_link_resume' failed for job %s (%s); falling back to two-step save.", job_id, e)
+
+    resume_id = save_customized_resume(resume_data, resume_path)
+    if resume_id and not update_job_with_resume_link(job_id, resume_id):
+        logging.error("Saved customized resume %s but failed to link it to job %s.", resume_id, job_id)
+    return resume_id
+
 def save_customized_resume(resume_data: 'Resume', resume_path: str) -> Optional[Any]: # Return type changed
     """
     Saves a customized resume to the Supabase 'customized_resumes' table.
@@ -454,8 +641,8 @@ def save_customized_resume(resume_data: 'Resume', resume_path: str) -> Optional[
         data_to_insert['resume_link'] = resume_path
 
         logging.info(
-            f"Saving customized resume for email: {getattr(resume_data, 'email', 'N/A')} "
-            f"with path '{resume_path}' to table '{config.SUPABASE_CUSTOMIZED_RESUMES_TABLE_NAME}'"
+            "Saving customized resume for email: %s with path '%s' to table '%s'",
+            getattr(resume_data, 'email', 'N/A'), resume_path, config.SUPABASE_CUSTOMIZED_RESUMES_TABLE_NAME
         )
 
         response = supabase.table(config.SUPABASE_CUSTOMIZED_RESUMES_TABLE_NAME)\
@@ -467,14 +654,14 @@ def save_customized_resume(resume_data: 'Resume', resume_path: str) -> Optional[
             if 'id' in inserted_record:
                 resume_id = inserted_record['id']
                 logging.info(
-                    f"Successfully saved customized resume for {getattr(resume_data, 'email', 'N/A')} "
-                    f"with ID: {resume_id}."
+                    "Successfully saved customized resume for %s with ID: %s.",
+                    getattr(resume_data, 'email', 'N/A'), resume_id
                 )
                 return resume_id
             else:
                 logging.warning(
-                    f"Customized resume for {getattr(resume_data, 'email', 'N/A')} saved, "
-                    f"but 'id' key not found in the response data. Full record: {inserted_record}"
+                    "Customized resume for %s saved, but 'id' key not found in the response data. Full record: %s",
+                    getattr(resume_data, 'email', 'N/A'), inserted_record
                 )
                 return None
         else:
@@ -482,26 +669,27 @@ def save_customized_resume(resume_data: 'Resume', resume_path: str) -> Optional[
             if hasattr(response, 'error') and response.error:
                 error_message = response.error
                 logging.error(
-                    f"Failed to save customized resume for {getattr(resume_data, 'email', 'N/A')}. "
-                    f"Supabase Error: {error_message}"
+                    "Failed to save customized resume for %s. Supabase Error: %s",
+                    getattr(resume_data, 'email', 'N/A'), error_message
                 )
             elif hasattr(response, 'message') and response.message:
                 error_message = response.message
                 logging.error(
-                    f"Failed to save customized resume for {getattr(resume_data, 'email', 'N/A')}. "
-                    f"Supabase API Error: {error_message}"
+                    "Failed to save customized resume for %s. Supabase API Error: %s",
+                    getattr(resume_data, 'email', 'N/A'), error_message
                 )
             else:
                 logging.warning(
-                    f"Customized resume for {getattr(resume_data, 'email', 'N/A')} might not have been saved "
-                    f"or ID not returned. Response data is empty or missing. Response: {response}"
+                    "Customized resume for %s might not have been saved or ID not returned. "
+                    "Response data is empty or missing. Response: %s",
+                    getattr(resume_data, 'email', 'N/A'), response
                 )
             return None
 
     except Exception as e:
         logging.error(
-            f"Error saving customized resume for {getattr(resume_data, 'email', 'N/A')} to Supabase: {e}",
-            exc_info=True
+            "Error saving customized resume for %s to Supabase: %s",
+            getattr(resume_data, 'email', 'N/A'), e, exc_info=True
         )
         return None
 
@@ -513,7 +701,7 @@ def get_customized_resume(resume_id: str) -> Optional[Dict[str, Any]]:
         return None
     
     try:
-        logging.info(f"Fetching customized resume data from database for ID: {resume_id}")
+        logging.info("Fetching customized resume data from database for ID: %s", resume_id)
         response = supabase.table(config.SUPABASE_CUSTOMIZED_RESUMES_TABLE_NAME)\
             .select("*")\
             .eq("id", resume_id)\
@@ -523,7 +711,7 @@ def get_customized_resume(resume_id: str) -> Optional[Dict[str, Any]]:
             return response.data[0]
         return None
     except Exception as e:
-        logging.error(f"Error fetching customized resume {resume_id}: {e}")
+        logging.error("Error fetching customized resume %s: %s", resume_id, e)
         return None
 
 
@@ -547,18 +735,18 @@ def download_resume_from_storage(file_name: str = "resume.pdf") -> Optional[byte
         return None
 
     try:
-        logging.info(f"Downloading '{file_name}' from Supabase Storage bucket '{bucket_name}'...")
+        logging.info("Downloading '%s' from Supabase Storage bucket '%s'...", file_name, bucket_name)
         file_bytes = supabase.storage.from_(bucket_name).download(file_name)
 
         if file_bytes:
-            logging.info(f"Successfully downloaded '{file_name}' ({len(file_bytes)} bytes).")
+            logging.info("Successfully downloaded '%s' (%s bytes).", file_name, len(file_bytes))
             return file_bytes
         else:
-            logging.warning(f"Downloaded empty content for '{file_name}' from bucket '{bucket_name}'.")
+            logging.warning("Downloaded empty content for '%s' from bucket '%s'.", file_name, bucket_name)
             return None
 
     except Exception as e:
-        logging.error(f"Error downloading '{file_name}' from Supabase Storage: {e}")
+        logging.error("Error downloading '%s' from Supabase Storage: %s", file_name, e)
         return None
 
 
@@ -580,24 +768,24 @@ def save_base_resume(resume_data: dict) -> bool:
     table_name = config.SUPABASE_BASE_RESUME_TABLE_NAME
     try:
         # Delete any existing base resume rows (there should only be one)
-        logging.info(f"Clearing existing base resume data from '{table_name}'...")
+        logging.info("Clearing existing base resume data from '%s'...", table_name)
         supabase.table(table_name).delete().neq("id", "00000000-0000-0000-0000-000000000000").execute()
 
         # Insert the new base resume
-        logging.info(f"Saving parsed base resume to '{table_name}'...")
+        logging.info("Saving parsed base resume to '%s'...", table_name)
         response = supabase.table(table_name).insert({
             "resume_data": resume_data
         }).execute()
 
         if response.data and len(response.data) > 0:
-            logging.info(f"Successfully saved base resume to '{table_name}'.")
+            logging.info("Successfully saved base resume to '%s'.", table_name)
             return True
         else:
-            logging.warning(f"Base resume insert returned no data. Response: {response}")
+            logging.warning("Base resume insert returned no data. Response: %s", response)
             return False
 
     except Exception as e:
-        logging.error(f"Error saving base resume to Supabase: {e}", exc_info=True)
+        logging.error("Error saving base resume to Supabase: %s", e, exc_info=True)
         return False
 
 
@@ -610,7 +798,7 @@ def get_base_resume() -> Optional[dict]:
     """
     table_name = config.SUPABASE_BASE_RESUME_TABLE_NAME
     try:
-        logging.info(f"Fetching base resume from '{table_name}'...")
+        logging.info("Fetching base resume from '%s'...", table_name)
         response = supabase.table(table_name)\
             .select("resume_data")\
             .order("created_at", desc=True)\
@@ -630,6 +818,6 @@ def get_base_resume() -> Optional[dict]:
             return None
 
     except Exception as e:
-        logging.error(f"Error fetching base resume from Supabase: {e}", exc_info=True)
+        logging.error("Error fetching base resume from Supabase: %s", e, exc_info=True)
         return None
 